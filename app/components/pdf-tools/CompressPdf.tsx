@@ -7,14 +7,26 @@ interface CompressionResult {
   originalSize: number;
   compressedSize: number;
   reduction: string;
+  targetMet: boolean | null;
 }
 
+type CompressionProfile = "screen" | "ebook" | "print" | "archive";
+
+const PROFILES: { value: CompressionProfile; label: string }[] = [
+  { value: "screen", label: "Screen (72 dpi, smallest)" },
+  { value: "ebook", label: "eBook (150 dpi, balanced)" },
+  { value: "print", label: "Print (300 dpi)" },
+  { value: "archive", label: "Archive (full resolution)" },
+];
+
 export default function Compress() {
   const [mounted, setMounted] = useState(false);
   const [file, setFile] = useState<File | null>(null);
   const [loading, setLoading] = useState(false);
   const [result, setResult] = useState<CompressionResult | null>(null);
   const [error, setError] = useState("");
+  const [profile, setProfile] = useState<CompressionProfile>("ebook");
+  const [targetSizeKb, setTargetSizeKb] = useState("");
   const [apiUrl] = useState("http://localhost:8000"); // Use the current origin for deployed version
 
   useEffect(() => {
@@ -53,6 +65,10 @@ export default function Compress() {
 
     const formData = new FormData();
     formData.append("file", file);
+    formData.append("profile", profile);
+    if (targetSizeKb) {
+      formData.append("target_size_kb", targetSizeKb);
+    }
 
     try {
       const response = await fetch(`${apiUrl}/api/v1/compress`, {
@@ -68,6 +84,7 @@ export default function Compress() {
       const originalSizeHeader = response.headers.get("x-original-size");
       const compressedSizeHeader = response.headers.get("x-compressed-size");
       const reductionHeader = response.headers.get("x-reduction");
+      const targetMetHeader = response.headers.get("x-target-met");
 
       const originalSize = originalSizeHeader
         ? parseInt(originalSizeHeader, 10)
@@ -99,6 +116,7 @@ export default function Compress() {
         originalSize,
         compressedSize: finalCompressedSize,
         reduction: finalReduction.toFixed(2),
+        targetMet: targetMetHeader === null ? null : targetMetHeader === "true",
       });
     } catch (err: unknown) {
       const message =
@@ -182,6 +200,50 @@ export default function Compress() {
           </label>
         </div>
 
+        {/* Compression Profile */}
+        <div className="mb-6 md:mb-8">
+          <label
+            htmlFor="compression-profile"
+            className="block text-sm font-semibold text-gray-700 mb-3"
+          >
+            Compression Level
+          </label>
+          <select
+            id="compression-profile"
+            value={profile}
+            onChange={(e) => setProfile(e.target.value as CompressionProfile)}
+            disabled={loading}
+            className="w-full border border-gray-300 rounded-xl px-4 py-3 text-gray-700 focus:outline-none focus:border-primary/90 disabled:bg-gray-50"
+          >
+            {PROFILES.map(({ value, label }) => (
+              <option key={value} value={value}>
+                {label}
+              </option>
+            ))}
+          </select>
+        </div>
+
+        {/* Target Size */}
+        <div className="mb-6 md:mb-8">
+          <label
+            htmlFor="target-size"
+            className="block text-sm font-semibold text-gray-700 mb-3"
+          >
+            Target Size in KB (optional)
+          </label>
+          <input
+            id="target-size"
+            type="number"
+            min={1}
+            step={1}
+            placeholder="e.g. 500 for a portal upload limit"
+            value={targetSizeKb}
+            onChange={(e) => setTargetSizeKb(e.target.value)}
+            disabled={loading}
+            className="w-full border border-gray-300 rounded-xl px-4 py-3 text-gray-700 focus:outline-none focus:border-primary/90 disabled:bg-gray-50"
+          />
+        </div>
+
         {/* Compress Button */}
         <button
           onClick={handleCompress}
@@ -272,6 +334,12 @@ export default function Compress() {
                 </p>
               </div>
             </div>
+            {result.targetMet === false && (
+              <p className="mt-4 text-sm text-amber-700">
+                The file could not be brought under {targetSizeKb} KB; this is
+                the smallest version we could produce.
+              </p>
+            )}
           </div>
         )}
       </div>
@@ -1,191 +1,483 @@
+import io
+import math
 import logging
 import os
-import io
 import tempfile
-from typing import Optional
-from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
 import asyncio
 
 import pikepdf
-from PIL import Image
 import fitz  # PyMuPDF
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from fastapi.responses import Response
 
+from app.core.admission import admission
+from app.core.config import settings
+from app.services.image_workers import SharedImage, image_pool, share_image, recompress_image
+from app.services.pdf_workers import PoolSaturated
+
 # Configure Logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+
+class CompressionProfile(NamedTuple):
+    dpi: Optional[int]  # images are downsampled to this on-page resolution; None keeps every pixel
+    quality: int  # JPEG quality of recompressed images
+
+
+# Roughly Ghostscript's -dPDFSETTINGS presets of the same names
+COMPRESSION_PROFILES: Dict[str, CompressionProfile] = {
+    "screen": CompressionProfile(dpi=72, quality=60),
+    "ebook": CompressionProfile(dpi=150, quality=75),
+    "print": CompressionProfile(dpi=300, quality=85),
+    "archive": CompressionProfile(dpi=None, quality=90),
+}
+
+# target_size_kb search steps after the profile's own pass, in roughly decreasing
+# output size: (factor on the profile's image scale, JPEG quality)
+TARGET_LADDER: List[Tuple[float, int]] = [
+    (1.0, 85),
+    (1.0, 75),
+    (1.0, 60),
+    (0.85, 60),
+    (0.85, 50),
+    (0.7, 50),
+    (0.7, 40),
+    (0.55, 40),
+    (0.55, 30),
+    (0.4, 30),
+    (0.3, 25),
+    (0.2, 20),
+    (0.15, 15),
+]
+
+
+def _stored_length(doc, xref: int) -> Optional[int]:
+    """An image stream's encoded size from its /Length, when stored inline."""
+    kind, value = doc.xref_get_key(xref, "Length")
+    return int(value) if kind == "int" else None
+
+
+def _image_streams(pdf: bytes) -> List[bytes]:
+    """Raw stream of every image object in a saved PDF."""
+    with fitz.open(stream=pdf, filetype="pdf") as doc:
+        return [
+            doc.xref_stream_raw(xref)
+            for xref in range(1, doc.xref_length())
+            if doc.xref_get_key(xref, "Subtype")[1] == "/Image"
+        ]
+
+
+async def _share(doc, xref: int):
+    """share_image in a thread. If cancelled, waits for the thread and frees its segment first."""
+    future = asyncio.ensure_future(asyncio.to_thread(share_image, doc, xref))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        # The thread keeps using doc; the caller must not close it until this returns
+        try:
+            shared = await future
+        except Exception:
+            shared = None
+        if shared:
+            shared[0].close()
+            shared[0].unlink()
+        raise
+
+
+class ImageCache:
+    """Shared-memory copies of a document's images, kept for every pass of a target-size search.
+
+    Each image is decoded (JPEGs: extracted) once and later passes only re-encode
+    it, up to `max_bytes` of segments in total: /dev/shm is small in containers
+    (64 MB by default in Docker). Images beyond that are decoded again on each pass.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.segments: Dict[int, Tuple[shared_memory.SharedMemory, SharedImage]] = {}
+        # xref → stored /Length, for every image recompressed
+        self.stored: Dict[int, Optional[int]] = {}
+        self.skipped: Set[int] = set()  # images share_image leaves as they are
+
+    def keep(self, xref: int, shm: shared_memory.SharedMemory, src: SharedImage) -> bool:
+        """Hold on to a segment if it fits under the cap; False: the caller frees it after use."""
+        if self.nbytes + src.nbytes > self.max_bytes:
+            return False
+        self.segments[xref] = (shm, src)
+        self.nbytes += src.nbytes
+        return True
+
+    def size(self, xref: int, results: Dict[int, bytes]) -> int:
+        """Bytes an image takes after a pass: its recompressed copy, or the kept original."""
+        if xref in results:
+            return len(results[xref])
+        return self.stored.get(xref) or 0
+
+    def close(self):
+        for shm, _ in self.segments.values():
+            shm.close()
+            shm.unlink()
+        self.segments.clear()
+        self.nbytes = 0
+
+
 class PDFProcessor:
     """Handle EXTREME PDF compression with logging and speed optimization"""
     
     @staticmethod
-    def process_image(img_data: tuple, doc, max_dimension: int = 1024, img_quality: int = 20):
-        """Process a single image (for parallel processing)"""
-        img_index, img, page_num = img_data
-        xref = img[0]
-        
+    def plan_images(doc, dpi: Optional[int]) -> Tuple[Dict[int, Tuple[int, float]], int]:
+        """xref → (first page showing it, downsampling scale), and the number of image references.
+
+        Shared images (logos, scan backgrounds) are planned once, however many pages
+        use them. The scale brings an image's largest placement down to `dpi`, so it
+        is never upsampled; an image that is never actually drawn is treated as
+        filling its page.
+        """
+        first_page: Dict[int, int] = {}
+        pixels: Dict[int, Tuple[int, int]] = {}
+        needed: Dict[int, float] = {}
+        references = 0
+        for page in doc:
+            images = doc.get_page_images(page.number, full=True)
+            for img in images:
+                first_page.setdefault(img[0], page.number)
+                pixels.setdefault(img[0], (img[2], img[3]))
+                references += 1
+            if dpi is None or not images:
+                continue
+
+            for info in page.get_image_info(xrefs=True):
+                xref, width, height = info["xref"], info["width"], info["height"]
+                if not xref or not width or not height:
+                    continue  # inline image
+                a, b, c, d = info["transform"][:4]
+                # Edge lengths of the placed image in points, whatever its rotation
+                scale = dpi / 72 * max(math.hypot(a, b) / width, math.hypot(c, d) / height)
+                needed[xref] = max(needed.get(xref, 0.0), scale)
+
+        plan: Dict[int, Tuple[int, float]] = {}
+        for xref, page_num in first_page.items():
+            if dpi is None:
+                scale = 1.0
+            elif xref in needed:
+                scale = needed[xref]
+            else:
+                width, height = pixels[xref]
+                rect = doc[page_num].rect
+                scale = dpi / 72 * max(rect.width / max(width, 1), rect.height / max(height, 1))
+            plan[xref] = (page_num, min(1.0, scale))
+        return plan, references
+
+    @staticmethod
+    async def recompress_images(
+        doc,
+        plan: Dict[int, Tuple[int, float]],
+        img_quality: int,
+        cache: Optional[ImageCache] = None,
+        scale_factor: float = 1.0,
+    ) -> Dict[int, bytes]:
+        """Recompress each image on the image pool.
+
+        Returns xref → JPEG bytes for the images that came out smaller.
+        With a cache, segments it keeps outlive the call and are reused by the next one.
+        """
+        image_pool.admit()
+        # fitz documents are not thread-safe: decode one image at a time
+        doc_lock = asyncio.Lock()
+        # Decoded pixels are large; keep only enough shared segments alive to feed every worker
+        window = asyncio.Semaphore(image_pool.workers * 2)
+
+        async def one(xref: int, page_num: int, scale: float):
+            async with window:
+                try:
+                    if cache is not None and xref in cache.skipped:
+                        return None
+                    if cache is not None and xref in cache.segments:
+                        (shm, src), stored, kept = cache.segments[xref], cache.stored[xref], True
+                    else:
+                        async with doc_lock:
+                            stored = _stored_length(doc, xref)
+                            shared = await _share(doc, xref)
+                        if shared is None:
+                            if cache is not None:
+                                cache.skipped.add(xref)
+                            return None  # small JPEG, already compact
+                        shm, src = shared
+                        kept = False
+                        if cache is not None:
+                            cache.stored[xref] = stored
+                            kept = cache.keep(xref, shm, src)
+                    try:
+                        compressed = await image_pool.run(
+                            recompress_image, src, scale * scale_factor, img_quality
+                        )
+                    finally:
+                        if not kept:
+                            shm.close()
+                            shm.unlink()
+                    if stored is not None and len(compressed) >= stored:
+                        return None  # e.g. a small JPEG under a high-quality profile
+                    return xref, compressed
+                except PoolSaturated:
+                    raise
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to process image xref {xref} (first on page {page_num + 1}): {e}"
+                    )
+                    return None
+
+        tasks = [
+            asyncio.ensure_future(one(xref, page_num, scale))
+            for xref, (page_num, scale) in plan.items()
+        ]
         try:
-            s = doc.extract_image(xref)
-            
-            # Skip small/already compressed JPEGs
-            if s['ext'].lower() in ('jpeg', 'jpg') and s['size'] < 50 * 1024:
-                return None
-            
-            image_bytes = s["image"]
-            pil_image = Image.open(io.BytesIO(image_bytes))
-            width, height = pil_image.size
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # gather returns on the first error; stop the rest and let them release their
+            # segments before the caller closes the document or the cache
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return dict(result for result in results if result)
 
-            # Check and resize only if needed
-            should_resize = width > max_dimension or height > max_dimension
-            
-            if should_resize:
-                ratio = min(max_dimension/width, max_dimension/height)
-                new_width = int(width * ratio)
-                new_height = int(height * ratio)
-                
-                # Use LANCZOS for better quality at similar speed
-                pil_image = pil_image.resize(
-                    (new_width, new_height),
-                    Image.Resampling.LANCZOS
+    @staticmethod
+    async def fit_to_target(
+        source,
+        plan: Dict[int, Tuple[int, float]],
+        cache: ImageCache,
+        quality: int,
+        results: Dict[int, bytes],
+        output: bytes,
+        target_bytes: int,
+        build: Callable[[Dict[int, bytes]], Awaitable[bytes]],
+    ) -> Tuple[bytes, int, bool]:
+        """Shrink images along TARGET_LADDER until the output fits; (output, passes, target met).
+
+        `results` and `output` are the profile's own pass. Everything but the
+        recompressed images is taken as fixed overhead, so the binary search over the
+        ladder only re-encodes images and sums their sizes; the PDF is rebuilt for the
+        step it picks, and one step lower at a time only if that build still overshoots.
+        """
+        steps = [step for step in TARGET_LADDER if step[1] < quality]
+        if not steps:
+            return output, 1, False
+
+        # The save merges some identical images but not others, so count the image
+        # streams the output really has, each standing for a source image
+        by_content: Dict[bytes, int] = {}
+        for xref, data in results.items():
+            by_content.setdefault(data, xref)
+        streams = await asyncio.to_thread(_image_streams, output)
+        slots = [by_content[data] for data in streams if data in by_content]
+        overhead = len(output) - sum(len(results[xref]) for xref in slots)
+        encoded: Dict[int, Dict[int, bytes]] = {}
+
+        async def encode(i: int) -> Dict[int, bytes]:
+            if i not in encoded:
+                scale_factor, step_quality = steps[i]
+                encoded[i] = await PDFProcessor.recompress_images(
+                    source, plan, step_quality, cache=cache, scale_factor=scale_factor
                 )
-                
-            if pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
-            
-            # Aggressive JPEG compression
-            img_buffer = io.BytesIO()
-            pil_image.save(
-                img_buffer,
-                format='JPEG',
-                quality=img_quality, 
-                optimize=True
+            return encoded[i]
+
+        # Highest-fidelity step whose images fit the budget, else the smallest step
+        lo, hi, best = 0, len(steps) - 1, len(steps) - 1
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            step_results = await encode(mid)
+            if overhead + sum(cache.size(xref, step_results) for xref in slots) <= target_bytes:
+                best, hi = mid, mid - 1
+            else:
+                lo = mid + 1
+
+        smallest = output
+        for i in range(best, len(steps)):
+            output = await build(await encode(i))
+            logger.info(
+                f"Target pass at scale x{steps[i][0]}, quality {steps[i][1]}: {len(output)} bytes"
             )
-            compressed_image_bytes = img_buffer.getvalue()
-            
-            return (xref, compressed_image_bytes)
-            
-        except Exception as e:
-            logger.warning(f"Failed to process image {img_index} on page {page_num + 1}: {e}")
-            return None
+            if len(output) <= target_bytes:
+                return output, len(encoded) + 1, True
+            smallest = min(smallest, output, key=len)
+        return smallest, len(encoded) + 1, False
     
     @staticmethod
     async def compress_pdf(
         input_bytes: bytes,
-        password: Optional[str] = None
+        password: Optional[str] = None,
+        profile: Optional[str] = None,
+        target_size_kb: Optional[int] = None,
     ) -> tuple[bytes, dict]:
         
+        profile = profile or settings.COMPRESS_PROFILE
+        options = COMPRESSION_PROFILES[profile]
+        target_bytes = target_size_kb * 1024 if target_size_kb else None
         original_size = len(input_bytes)
         temp_files = []
+        # Small and typical uploads never touch the disk; only large ones are spooled
+        spool = original_size > settings.COMPRESS_SPOOL_THRESHOLD_MB * 1024 * 1024
         
         try:
-            # Setup temporary files
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_input:
-                tmp_input.write(input_bytes)
-                tmp_input.flush()
-                input_path = tmp_input.name
-                temp_files.append(input_path)
-            
-            intermediate_path = input_path.replace('.pdf', '_intermediate.pdf')
-            output_path = input_path.replace('.pdf', '_compressed.pdf')
-            temp_files.append(intermediate_path)
-            temp_files.append(output_path)
-            
-            logger.info(f"Starting compression. Original size: {original_size} bytes.")
-            
-            # Hardcoded settings
-            target_dpi = 72
-            img_quality = 80
-            max_dimension = 1024
-            
-            # --- STEP 1: Parallel Image Processing ---
-            doc = fitz.open(input_path)
+            if spool:
+                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_input:
+                    tmp_input.write(input_bytes)
+                    input_path = tmp_input.name
+                    temp_files.append(input_path)
+
+                intermediate_path = input_path.replace(".pdf", "_intermediate.pdf")
+                output_path = input_path.replace(".pdf", "_compressed.pdf")
+                temp_files.append(intermediate_path)
+                temp_files.append(output_path)
             
-            # Collect all images with their page numbers
-            all_images = []
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                image_list = page.get_images(full=True)
-                for img_index, img in enumerate(image_list):
-                    all_images.append((img_index, img, page_num))
+            logger.info(
+                f"Starting compression ({profile}"
+                f"{f', target {target_size_kb} KB' if target_bytes else ''}). "
+                f"Original size: {original_size} bytes"
+                f"{' (spooled to disk)' if spool else ''}."
+            )
             
-            if all_images:
-                logger.info(f"Processing {len(all_images)} images across {len(doc)} pages...")
-                
-                # Process images in parallel using ThreadPoolExecutor
-                loop = asyncio.get_event_loop()
-                with ThreadPoolExecutor(max_workers=4) as executor:
-                    tasks = [
-                        loop.run_in_executor(
-                            executor,
-                            PDFProcessor.process_image,
-                            img_data,
-                            doc,
-                            max_dimension,
-                            img_quality
+            def open_source():
+                return (
+                    fitz.open(input_path)
+                    if spool
+                    else fitz.open(stream=input_bytes, filetype="pdf")
+                )
+
+            def swap_and_save(results: Dict[int, bytes], doc=None):
+                """Swap the recompressed images into doc (default: a fresh source copy) and save."""
+                doc = doc if doc is not None else open_source()
+                try:
+                    # replace_image rewrites the image object itself, so one call on the
+                    # owning page updates every page that shows it
+                    replaced = 0
+                    for xref, compressed_bytes in results.items():
+                        page_num = plan[xref][0]
+                        try:
+                            doc[page_num].replace_image(xref, stream=compressed_bytes)
+                            replaced += 1
+                        except Exception as e:
+                            logger.warning(
+                                f"Failed to replace image xref {xref} on page {page_num + 1}: {e}"
+                            )
+                    if plan:
+                        logger.info(f"Replaced {replaced}/{len(plan)} images.")
+
+                    logger.info("Image optimization complete. Starting structural saving.")
+
+                    # Save with aggressive settings
+                    intermediate = intermediate_path if spool else io.BytesIO()
+                    doc.save(
+                        intermediate,
+                        garbage=4,
+                        deflate=True,
+                        clean=True,
+                        pretty=False,  # Faster saving
+                    )
+                    return intermediate
+                finally:
+                    doc.close()
+
+            async def build(results: Dict[int, bytes], doc=None) -> bytes:
+                """Save with the recompressed images swapped in, then clean up the structure.
+
+                Every step runs in a thread: a target-size search repeats them per pass.
+                """
+                intermediate = await asyncio.to_thread(swap_and_save, results, doc)
+
+                # --- STEP 2: Quick Structure Cleanup ---
+                def pikepdf_process() -> bytes:
+                    if not spool:
+                        intermediate.seek(0)
+                    output = output_path if spool else io.BytesIO()
+                    with pikepdf.open(intermediate, password=password or "") as pdf:
+                        try:
+                            with pdf.open_metadata() as meta:
+                                meta.clear()
+                        except Exception:
+                            pass
+
+                        pdf.save(
+                            output,
+                            compress_streams=True,
+                            stream_decode_level=pikepdf.StreamDecodeLevel.generalized,
+                            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                            linearize=True,  # Enable linearization for faster web viewing
                         )
-                        for img_data in all_images
-                    ]
-                    results = await asyncio.gather(*tasks)
+                    if not spool:
+                        return output.getvalue()
+                    with open(output_path, "rb") as f:
+                        return f.read()
                 
-                # Apply compressed images back to pages
-                for page_num in range(len(doc)):
-                    page = doc[page_num]
-                    for result in results:
-                        if result:
-                            xref, compressed_bytes = result
-                            try:
-                                page.replace_image(xref, stream=compressed_bytes)
-                            except:
-                                pass  # Image might not be on this page
-            
-            logger.info("Image optimization complete. Starting structural saving.")
+                # Run pikepdf in thread pool
+                loop = asyncio.get_event_loop()
+                return await loop.run_in_executor(None, pikepdf_process)
             
-            # Save with aggressive settings
-            doc.save(
-                intermediate_path,
-                garbage=4,
-                deflate=True,
-                clean=True,
-                pretty=False  # Faster saving
+            # --- STEP 1: Parallel Image Processing ---
+            source = await asyncio.to_thread(open_source)
+            # A target-size search keeps every image decoded across passes and
+            # builds each attempt from a fresh copy of the source
+            cache = (
+                ImageCache(settings.COMPRESS_IMAGE_CACHE_MB * 1024 * 1024) if target_bytes else None
             )
-            doc.close()
-            
-            # --- STEP 2: Quick Structure Cleanup ---
-            def pikepdf_process():
-                with pikepdf.open(intermediate_path, password=password or '') as pdf:
-                    try:
-                        with pdf.open_metadata() as meta:
-                            meta.clear()
-                    except Exception:
-                        pass
-                    
-                    pdf.save(
-                        output_path,
-                        compress_streams=True,
-                        stream_decode_level=pikepdf.StreamDecodeLevel.generalized,
-                        object_stream_mode=pikepdf.ObjectStreamMode.generate,
-                        linearize=True  # Enable linearization for faster web viewing
+            try:
+                plan, references = await asyncio.to_thread(
+                    PDFProcessor.plan_images, source, options.dpi
+                )
+
+                results: Dict[int, bytes] = {}
+                if plan:
+                    logger.info(
+                        f"Processing {len(plan)} unique images ({references} references) "
+                        f"across {len(source)} pages..."
                     )
-            
-            # Run pikepdf in thread pool
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, pikepdf_process)
-            
-            # Read final file
-            with open(output_path, 'rb') as f:
-                compressed_bytes = f.read()
+                    results = await PDFProcessor.recompress_images(
+                        source, plan, options.quality, cache=cache
+                    )
+
+                if cache is None:
+                    compressed_bytes = await build(results, source)
+                else:
+                    compressed_bytes = await build(results)
+                    passes, target_met = 1, len(compressed_bytes) <= target_bytes
+                    if not target_met and cache.stored:
+                        compressed_bytes, passes, target_met = await PDFProcessor.fit_to_target(
+                            source,
+                            plan,
+                            cache,
+                            options.quality,
+                            results,
+                            compressed_bytes,
+                            target_bytes,
+                            build,
+                        )
+            finally:
+                if cache is not None:
+                    cache.close()
+                if not source.is_closed:
+                    source.close()
             
             compressed_size = len(compressed_bytes)
             reduction = ((original_size - compressed_size) / original_size) * 100
             
             metadata = {
-                'original_size': original_size,
-                'compressed_size': compressed_size,
-                'reduction_percentage': round(reduction, 2),
-                'was_encrypted': password is not None
+                "original_size": original_size,
+                "compressed_size": compressed_size,
+                "reduction_percentage": round(reduction, 2),
+                "was_encrypted": password is not None,
+                "profile": profile,
             }
+            if target_bytes:
+                metadata.update(target_size_kb=target_size_kb, target_met=target_met, passes=passes)
+                logger.info(
+                    f"Target {target_size_kb} KB {'met' if target_met else 'not reachable'} "
+                    f"after {passes} image passes."
+                )
             
             logger.info(f"Compression complete. Reduced by {metadata['reduction_percentage']}%.")
             return compressed_bytes, metadata
@@ -193,6 +485,8 @@ class PDFProcessor:
         except pikepdf.PasswordError:
             logger.error("Invalid password provided.")
             raise ValueError("Invalid password for encrypted PDF")
+        except PoolSaturated:
+            raise
         except Exception as e:
             logger.critical(f"Critical compression failure: {str(e)}", exc_info=True)
             raise Exception(f"Compression failed: {str(e)}")
@@ -210,7 +504,9 @@ class PDFProcessor:
 @router.post("/compress")
 async def compress_pdf(
     file: UploadFile = File(...),
-    password: Optional[str] = Form(None)
+    password: Optional[str] = Form(None),
+    profile: str = Form(settings.COMPRESS_PROFILE),
+    target_size_kb: Optional[int] = Form(None),
 ):
     """Compress PDF file with MAXIMUM AGGRESSION and SPEED"""
     
@@ -218,7 +514,19 @@ async def compress_pdf(
 
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are allowed")
-    
+    if profile not in COMPRESSION_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Unknown compression profile '{profile}'. "
+                f"Use one of: {', '.join(COMPRESSION_PROFILES)}"
+            ),
+        )
+    if target_size_kb is not None and target_size_kb <= 0:
+        raise HTTPException(
+            status_code=400, detail="target_size_kb must be a positive number of kilobytes"
+        )
+
     content = await file.read()
     
     if len(content) > 100 * 1024 * 1024:
@@ -226,26 +534,36 @@ async def compress_pdf(
         raise HTTPException(status_code=413, detail="File too large. Maximum size is 100MB")
     
     try:
-        compressed_bytes, metadata = await PDFProcessor.compress_pdf(
-            content, 
-            password=password
-        )
+        async with admission.slot("compress"):
+            compressed_bytes, metadata = await PDFProcessor.compress_pdf(
+                content, password=password, profile=profile, target_size_kb=target_size_kb
+            )
         
         headers = {
             "Content-Disposition": f'attachment; filename="compressed_{file.filename}"',
-            "X-Original-Size": str(metadata['original_size']),
-            "X-Compressed-Size": str(metadata['compressed_size']),
-            "X-Reduction": str(metadata['reduction_percentage']),
-            "Access-Control-Expose-Headers": "X-Original-Size, X-Compressed-Size, X-Reduction",
-            "Cache-Control": "no-cache"  # Prevent caching issues
+            "X-Original-Size": str(metadata["original_size"]),
+            "X-Compressed-Size": str(metadata["compressed_size"]),
+            "X-Reduction": str(metadata["reduction_percentage"]),
+            "X-Compression-Profile": metadata["profile"],
+            "Access-Control-Expose-Headers": (
+                "X-Original-Size, X-Compressed-Size, X-Reduction, "
+                "X-Compression-Profile, X-Target-Met"
+            ),
+            "Cache-Control": "no-cache",  # Prevent caching issues
         }
-        
+        if "target_met" in metadata:
+            headers["X-Target-Met"] = str(metadata["target_met"]).lower()
+
         return Response(
             content=compressed_bytes,
             media_type="application/pdf",
             headers=headers
         )
         
+    except HTTPException:
+        raise
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
     except Exception as e:
@@ -0,0 +1,65 @@
+# backend/app/api/v1/fill_jobs.py
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse, JSONResponse
+
+from app.api.v1.pdf_routes import FillRequest, _validate_options
+from app.services.form_registry import FORM_CONFIGS, GENERATORS
+from app.services.pdf_filler import normalize_form_id
+from app.services.fill_jobs import fill_jobs, QueueFull, DONE, FAILED
+
+router = APIRouter()
+
+# Long-poll cap; keeps requests well under typical proxy timeouts
+MAX_WAIT_SECONDS = 30
+
+
+@router.post("/fill-jobs", status_code=202)
+async def submit_fill_job(request: FillRequest):
+    _validate_options(request)
+    if (
+        request.formId.lower() not in GENERATORS
+        and normalize_form_id(request.formId) not in FORM_CONFIGS
+    ):
+        raise HTTPException(status_code=404, detail=f"Form '{request.formId}' not supported")
+    try:
+        job_id = await fill_jobs.submit(request.formId, request.data, request.fill_options())
+    except QueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+
+    return JSONResponse(
+        status_code=202,
+        content={
+            "jobId": job_id,
+            "status": "queued",
+            "statusUrl": f"/api/v1/fill-jobs/{job_id}",
+            "resultUrl": f"/api/v1/fill-jobs/{job_id}/result",
+        },
+        headers={"Location": f"/api/v1/fill-jobs/{job_id}"},
+    )
+
+
+@router.get("/fill-jobs/{job_id}")
+async def get_fill_job(job_id: str, wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS)):
+    """Job status. With ?wait=N the response is held until the job finishes or N seconds pass."""
+    job = await fill_jobs.get(job_id, wait=wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/fill-jobs/{job_id}/result")
+async def get_fill_job_result(job_id: str):
+    job = await fill_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=422, detail=f"PDF generation error: {job['error']}")
+    if job["status"] != DONE:
+        raise HTTPException(
+            status_code=409, detail=f"Job is {job['status']}", headers={"Retry-After": "2"}
+        )
+    return FileResponse(
+        fill_jobs.store.result_path(job_id),
+        media_type="application/pdf",
+        filename=f"{job['formId']}_filled.pdf",
+    )
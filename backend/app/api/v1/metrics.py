@@ -0,0 +1,12 @@
+# backend/app/api/v1/metrics.py
+from fastapi import APIRouter
+
+from app.core.metrics import metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """Per-stage latency histograms (ms), counters and gauges for this worker process."""
+    return metrics.snapshot()
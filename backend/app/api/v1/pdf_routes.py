@@ -1,75 +1,576 @@
 # backend/app/api/v1/pdf_routes.py
-from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Request, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse, FileResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Union
 
-import fitz
+import io
+import re
+import json
+import base64
+import time
+import hashlib
+import zipfile
 
-from app.services.pdf_filler import PDFFillerService
-from app.services.ds260_generator import DS260GeneratorService
-from app.services.police_letter_generator import PoliceLetterGeneratorService
-from app.services.authority_letter_generator import AuthorityLetterGeneratorService
+from app.core.config import settings
+from app.core.metrics import metrics, server_timing_header
+from app.core.admission import admission
+
+from app.services.pdf_filler import (
+    PDFFillerService,
+    SAVE_PROFILES,
+    APPEARANCE_MODES,
+    FORM_CONFIGS,
+    normalize_form_id,
+    find_pdf_template,
+)
+from app.services.template_cache import template_cache
+from app.services.field_converters import FormDataError, report_header
+from app.services.output_cache import output_cache, preview_cache, canonical_form_data
+from app.services.pdf_workers import pdf_pool, render_form, PoolSaturated
+from app.services.field_catalogue import FieldCatalogue, name_matcher
+from app.services.packet_service import project_profile, render_packet
+from app.services.preview_service import (
+    PREVIEW_FORMATS,
+    preview_key,
+    page_count_key,
+    split_pages,
+    render_previews,
+)
+from app.core.form_configs.packet_config import DEFAULT_PACKET
 
 router = APIRouter()
 
 class FillRequest(BaseModel):
     formId: str
     data: Dict[str, Any]
+    saveProfile: Optional[str] = None  # full | fast
+    appearanceMode: Optional[str] = None  # update | deferred | batched (AcroForm forms only)
+    # Non-editable output: appearances burned in, form removed (AcroForm forms only)
+    flatten: bool = False
+
+    def fill_options(self) -> Dict[str, Any]:
+        """PDFFillerService.fill_pdf kwargs with server defaults applied."""
+        return {
+            "save_profile": self.saveProfile or settings.PDF_SAVE_PROFILE,
+            "appearance_mode": self.appearanceMode or settings.PDF_APPEARANCE_MODE,
+            "flatten": self.flatten,
+        }
+
+
+def _validate_options(request: Union[FillRequest, "PacketRequest"]):
+    if request.saveProfile and request.saveProfile not in SAVE_PROFILES:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown saveProfile. Available: {list(SAVE_PROFILES.keys())}"
+        )
+    if request.appearanceMode and request.appearanceMode not in APPEARANCE_MODES:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown appearanceMode. Available: {list(APPEARANCE_MODES)}"
+        )
+
+
+def _output_cache_key(request: FillRequest) -> Optional[str]:
+    """Content address for AcroForm fills; None for generated letters (they embed today's date etc.)
+
+    Blocking: the first call for a form reads, hashes and possibly preprocesses its template.
+    """
+    form_id = normalize_form_id(request.formId)
+    if not output_cache.enabled or form_id not in FORM_CONFIGS:
+        return None
+    template_version = template_cache.version(find_pdf_template(form_id))
+    data = canonical_form_data(request.data, FORM_CONFIGS[form_id])
+    return output_cache.make_key(form_id, template_version, data, request.fill_options())
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
 
 @router.post("/fill-pdf")
-async def fill_pdf(request: FillRequest):
+async def fill_pdf(request: FillRequest, http_request: Request):
+    _validate_options(request)
+    started = time.perf_counter()
+    metric_prefix = f"fill.{re.sub(r'[^a-z0-9_]', '', request.formId.lower())}"
     try:
-        if request.formId.lower() == "ds260":
-             generator = DS260GeneratorService()
-             output = generator.generate_pdf(form_data=request.data)
-        elif request.formId.lower() == "police_verification":
-             generator = PoliceLetterGeneratorService()
-             province = request.data.get('province', '')
-             output = generator.generate_pdf(form_data=request.data, province=province)
-        elif request.formId.lower() == "authority_letter":
-             generator = AuthorityLetterGeneratorService()
-             output = generator.generate_pdf(form_data=request.data)
-        else:
-             pdf_service = PDFFillerService(form_id=request.formId)
-             output = pdf_service.fill_pdf(form_data=request.data)
-        
-        return StreamingResponse(
-            output,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={request.formId}_filled.pdf"}
+        headers = {
+            "Content-Disposition": f"attachment; filename={request.formId}_filled.pdf",
+            "Access-Control-Expose-Headers": "ETag, X-Cache, Server-Timing, X-Fill-Report",
+        }
+
+        # The first lookup per form resolves (and may preprocess) its template: off the event loop
+        cache_key = await run_in_threadpool(_output_cache_key, request)
+        if cache_key:
+            etag = f'"{cache_key}"'
+            headers["ETag"] = etag
+            if _etag_matches(http_request.headers.get("if-none-match", ""), etag):
+                metrics.incr(f"{metric_prefix}.not_modified")
+                return Response(status_code=304, headers={"ETag": etag})
+
+            cached_path = output_cache.get(cache_key)
+            if cached_path:
+                metrics.incr(f"{metric_prefix}.cache_hit")
+                elapsed = (time.perf_counter() - started) * 1000
+                headers["Server-Timing"] = server_timing_header({"cache": elapsed})
+                return FileResponse(
+                    cached_path, media_type="application/pdf", headers={**headers, "X-Cache": "HIT"}
+                )
+            headers["X-Cache"] = "MISS"
+
+        # Generation is CPU-bound; run it in the worker pool so the event loop stays free
+        pool_started = time.perf_counter()
+        async with admission.slot("fill-pdf"):
+            result = await pdf_pool.run(
+                render_form, request.formId, request.data, request.fill_options()
+            )
+        pool_ms = (time.perf_counter() - pool_started) * 1000
+
+        if cache_key:
+            await run_in_threadpool(output_cache.put, cache_key, result.pdf)
+
+        # Worker stages, plus queueing/IPC overhead and the end-to-end total
+        stages = dict(result.timings["stages"])
+        stages["queue"] = max(0.0, pool_ms - sum(stages.values()))
+        stages["total"] = (time.perf_counter() - started) * 1000
+        metrics.record(metric_prefix, {"stages": stages, "counts": result.timings["counts"]})
+        headers["Server-Timing"] = server_timing_header(stages)
+        if result.report:
+            headers["X-Fill-Report"] = report_header(result.report["counts"])
+
+        return Response(content=result.pdf, media_type="application/pdf", headers=headers)
+    except HTTPException:
+        raise
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except FormDataError as e:
+        raise HTTPException(
+            status_code=422, detail={"message": str(e), "errors": e.errors, "report": e.report}
         )
     except (ValueError, FileNotFoundError) as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"PDF generation error: {str(e)}")
 
+
+def _validate_payload(form_id: str, data: Dict[str, Any]):
+    return PDFFillerService(form_id=form_id).validate(data)
+
+
+@router.post("/fill-pdf/validate")
+async def validate_fill_request(request: FillRequest):
+    """Dry run of /fill-pdf: which keys would be filled, skipped or rejected.
+
+    No PDF is generated.
+    Uses the compiled mapping only, so it is cheap enough to call on every form save.
+    """
+    form_id = normalize_form_id(request.formId)
+    if form_id not in FORM_CONFIGS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Form '{request.formId}' has no field mapping to validate against",
+        )
+    try:
+        report = await run_in_threadpool(_validate_payload, form_id, request.data)
+    except (ValueError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Validation error: {str(e)}")
+    return JSONResponse(
+        {"formId": form_id, **report.as_dict()},
+        headers={
+            "X-Fill-Report": report.header(),
+            "Access-Control-Expose-Headers": "X-Fill-Report",
+        },
+    )
+
+
+class PreviewRequest(FillRequest):
+    pages: Optional[List[int]] = None  # 1-based page numbers; default: first page
+    format: str = "png"  # png | webp
+    dpi: Optional[int] = None  # default: PREVIEW_DPI
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def _filled_pdf(request: FillRequest, fill_key: Optional[str]) -> bytes:
+    """Filled PDF for request: from the output cache if possible, else the pool (and cached)."""
+    cached_path = output_cache.get(fill_key) if fill_key else None
+    if cached_path:
+        try:
+            return await run_in_threadpool(_read_file, cached_path)
+        except OSError:
+            pass  # evicted between get() and the read
+    result = await pdf_pool.run(render_form, request.formId, request.data, request.fill_options())
+    if fill_key:
+        await run_in_threadpool(output_cache.put, fill_key, result.pdf)
+    return result.pdf
+
+
+@router.post("/fill-pdf/preview")
+async def preview_pdf(request: PreviewRequest):
+    """Low-resolution PNG/WebP thumbnails of selected pages of the filled form.
+
+    Pages are rendered in parallel on the worker pool and cached by the fill's
+    content hash, so viewing the same fill again does not re-render.
+    """
+    _validate_options(request)
+    fmt = request.format.lower()
+    if fmt not in PREVIEW_FORMATS:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown format. Available: {list(PREVIEW_FORMATS)}"
+        )
+    dpi = request.dpi or settings.PREVIEW_DPI
+    if not 12 <= dpi <= settings.PREVIEW_MAX_DPI:
+        raise HTTPException(
+            status_code=400, detail=f"dpi must be between 12 and {settings.PREVIEW_MAX_DPI}"
+        )
+    pages = sorted(set(request.pages or [1]))
+    if pages[0] < 1:
+        raise HTTPException(status_code=400, detail="Page numbers start at 1")
+    if len(pages) > settings.PREVIEW_MAX_PAGES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many pages. Maximum is {settings.PREVIEW_MAX_PAGES} per request",
+        )
+
+    # Deferred appearances leave fields for the viewer to draw; a rasterized page needs real ones
+    if request.fill_options()["appearance_mode"] == "deferred":
+        request = request.model_copy(update={"appearanceMode": "batched"})
+
+    started = time.perf_counter()
+    stages: Dict[str, float] = {}
+    images: Dict[int, bytes] = {}
+    page_count = None
+    try:
+        # None for generated letters: nothing to cache against
+        fill_key = await run_in_threadpool(_output_cache_key, request)
+        count_path = preview_cache.get(page_count_key(fill_key)) if fill_key else None
+        if count_path:
+            try:
+                page_count = int(await run_in_threadpool(_read_file, count_path))
+            except (OSError, ValueError):
+                page_count = None
+        if page_count is not None:
+            for page in pages:
+                path = preview_cache.get(preview_key(fill_key, page, dpi, fmt))
+                if path:
+                    try:
+                        images[page] = await run_in_threadpool(_read_file, path)
+                    except OSError:
+                        pass
+        stages["cache"] = (time.perf_counter() - started) * 1000
+
+        missing = [p for p in pages if p not in images and (page_count is None or p <= page_count)]
+        if missing:
+            async with admission.slot("preview"):
+                fill_started = time.perf_counter()
+                pdf = await _filled_pdf(request, fill_key)
+                stages["fill"] = (time.perf_counter() - fill_started) * 1000
+
+                render_started = time.perf_counter()
+                pdf_pool.admit()
+                jobs = ((pdf, chunk, dpi, fmt) for chunk in split_pages(missing, pdf_pool.workers))
+                async for _, result in pdf_pool.map_unordered(render_previews, jobs):
+                    if isinstance(result, Exception):
+                        raise result
+                    page_count = result.page_count
+                    images.update(result.images)
+                    metrics.record("preview.render", result.timings)
+                stages["render"] = (time.perf_counter() - render_started) * 1000
+
+            if fill_key:
+                await run_in_threadpool(
+                    preview_cache.put, page_count_key(fill_key), str(page_count).encode()
+                )
+                for page in missing:
+                    if page in images:
+                        await run_in_threadpool(
+                            preview_cache.put, preview_key(fill_key, page, dpi, fmt), images[page]
+                        )
+    except HTTPException:
+        raise
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except FormDataError as e:
+        raise HTTPException(
+            status_code=422, detail={"message": str(e), "errors": e.errors, "report": e.report}
+        )
+    except (ValueError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Preview error: {str(e)}")
+
+    out_of_range = [p for p in pages if p not in images]
+    if out_of_range:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Pages {out_of_range} out of range (document has {page_count} pages)",
+        )
+
+    stages["total"] = (time.perf_counter() - started) * 1000
+    metrics.record(
+        "preview", {"stages": stages, "counts": {"pages": len(pages), "rendered": len(missing)}}
+    )
+    data_prefix = f"data:{PREVIEW_FORMATS[fmt]};base64,"
+    return JSONResponse(
+        {
+            "formId": request.formId,
+            "pageCount": page_count,
+            "format": fmt,
+            "dpi": dpi,
+            "pages": [
+                {
+                    "page": p,
+                    "size": len(images[p]),
+                    "image": data_prefix + base64.b64encode(images[p]).decode("ascii"),
+                }
+                for p in pages
+            ],
+        },
+        headers={
+            "X-Cache": "MISS" if missing else "HIT",
+            "Server-Timing": server_timing_header(stages),
+            "Access-Control-Expose-Headers": "X-Cache, Server-Timing",
+        },
+    )
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only sink for zipfile; drained after every member so nothing accumulates."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+@router.post("/fill-pdf/batch")
+async def fill_pdf_batch(items: List[FillRequest]):
+    if not items:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(items) > settings.MAX_BATCH_ITEMS:
+        raise HTTPException(
+            status_code=413, detail=f"Batch too large. Maximum is {settings.MAX_BATCH_ITEMS} items"
+        )
+    for item in items:
+        _validate_options(item)
+
+    # Reject up front; once the ZIP starts streaming we can no longer change the status code
+    try:
+        pdf_pool.admit()
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+    names = [
+        f"{i + 1:03d}_{re.sub(r'[^A-Za-z0-9_-]', '', item.formId) or 'form'}"
+        for i, item in enumerate(items)
+    ]
+
+    async def zip_chunks():
+        sink = _ZipStream()
+        manifest = []
+        # PDFs are already compressed; storing avoids burning event-loop CPU on deflate
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as zf:
+            jobs = ((item.formId, item.data, item.fill_options()) for item in items)
+            async for i, result in pdf_pool.map_unordered(render_form, jobs):
+                if isinstance(result, Exception):
+                    entry = {"index": i, "formId": items[i].formId, "error": str(result)}
+                    if isinstance(result, FormDataError):
+                        entry["errors"] = result.errors
+                    manifest.append(entry)
+                    continue
+                metrics.record(
+                    f"batch.{re.sub(r'[^a-z0-9_]', '', items[i].formId.lower())}", result.timings
+                )
+                zf.writestr(f"{names[i]}.pdf", result.pdf)
+                entry = {
+                    "index": i,
+                    "formId": items[i].formId,
+                    "file": f"{names[i]}.pdf",
+                    "size": len(result.pdf),
+                }
+                if result.report:
+                    entry["report"] = result.report["counts"]
+                manifest.append(entry)
+                yield sink.drain()
+
+            manifest.sort(key=lambda m: m["index"])
+            zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+        yield sink.drain()
+
+    return StreamingResponse(
+        zip_chunks(),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=filled_forms.zip"},
+    )
+
+
+class PacketRequest(BaseModel):
+    profile: Dict[str, Any]  # canonical applicant profile, see packet_config.PROFILE_FIELDS
+    forms: Optional[List[str]] = None  # default: DEFAULT_PACKET
+    overrides: Dict[str, Dict[str, Any]] = {}  # formId → extra form keys, applied after projection
+    saveProfile: Optional[str] = None
+    appearanceMode: Optional[str] = None
+    flatten: bool = False  # flatten every form before merging (no renamed duplicate fields)
+
+
+@router.post("/fill-packet")
+async def fill_packet(request: PacketRequest):
+    started = time.perf_counter()
+    forms = [normalize_form_id(f) for f in (request.forms or DEFAULT_PACKET)]
+    unknown = [f for f in forms if f not in FORM_CONFIGS]
+    if not forms or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported packet forms: {unknown}. Available: {list(FORM_CONFIGS.keys())}",
+        )
+    if len(forms) > settings.MAX_BATCH_ITEMS:
+        raise HTTPException(
+            status_code=413, detail=f"Packet too large. Maximum is {settings.MAX_BATCH_ITEMS} forms"
+        )
+    _validate_options(request)
+
+    overrides = {normalize_form_id(k): v for k, v in request.overrides.items()}
+    payloads = project_profile(request.profile, forms, overrides)
+    fill_options = {
+        "appearance_mode": request.appearanceMode or settings.PDF_APPEARANCE_MODE,
+        "flatten": request.flatten,
+    }
+
+    # One worker fills and merges every form: each is serialized once, as part of the packet
+    try:
+        merged = await pdf_pool.run(
+            render_packet,
+            [(form_id, payloads[form_id]) for form_id in forms],
+            fill_options,
+            request.saveProfile or settings.PDF_SAVE_PROFILE,
+        )
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except FormDataError as e:
+        raise HTTPException(
+            status_code=422, detail={"message": str(e), "errors": e.errors, "report": e.report}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"PDF generation error: {e}")
+    for form_id, form in merged.report.items():
+        metrics.record(f"packet.{form_id}", form["timings"])
+
+    stages = {**merged.timings["stages"], "total": (time.perf_counter() - started) * 1000}
+    metrics.record("packet", {"stages": stages, "counts": merged.timings["counts"]})
+    return Response(
+        content=merged.pdf,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": "attachment; filename=packet_filled.pdf",
+            "Access-Control-Expose-Headers": "Server-Timing",
+            "Server-Timing": server_timing_header(stages),
+        },
+    )
+
+
+def _field_catalogue(form_id: str):
+    """(service, template, catalogue, coverage); the catalogue is built once per template."""
+    service = PDFFillerService(form_id=form_id)
+    template = template_cache.get(service.pdf_path)
+    catalogue = template.derive("field_catalogue", FieldCatalogue)
+    coverage = catalogue.coverage(
+        service.form_id, service.field_mapping, service.widget_index(template)
+    )
+    return service, template, catalogue, coverage
+
+
 @router.get("/debug-pdf-fields/{form_id}")
-async def debug_pdf_fields(form_id: str):
+async def debug_pdf_fields(
+    form_id: str,
+    http_request: Request,
+    page: Optional[int] = Query(None, ge=1),
+    type: Optional[str] = Query(None, description="Widget type, e.g. Text, CheckBox, ComboBox"),
+    name: Optional[str] = Query(
+        None,
+        max_length=200,
+        description="Case-insensitive substring, or glob (* ? [...]), of the full field name",
+    ),
+    mapped: Optional[bool] = Query(
+        None, description="Only fields FIELD_MAPPING fills (true) or misses (false)"
+    ),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
     try:
-        pdf_service = PDFFillerService(form_id=form_id)
-        doc = fitz.open(pdf_service.pdf_path)
-        fields = [
-            {
-                "page": page_num + 1,
-                "name": w.field_name,
-                "type": w.field_type_string,
-                "value": w.field_value,
-                "rect": list(w.rect),
-            }
-            for page_num, page in enumerate(doc)
-            for w in page.widgets()
-        ]
-        doc.close()
+        service, template, catalogue, coverage = await run_in_threadpool(_field_catalogue, form_id)
+    except (ValueError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
-        return {
+    # Everything below is derived from the template version, so pollers can revalidate cheaply
+    query_hash = hashlib.sha1(http_request.url.query.encode()).hexdigest()[:12]
+    etag = f'"{service.form_id}-{template.version}-{query_hash}"'
+    if _etag_matches(http_request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    matched = catalogue.query(
+        page, type, name_matcher(name), mapped, catalogue.mapped_names(service.form_id)
+    )
+    next_offset = offset + limit if offset + limit < len(matched) else None
+    return JSONResponse(
+        {
             "form_id": form_id,
-            "pdf_path": pdf_service.pdf_path,
-            "total_pdf_fields": len(fields),
-            "mapped_in_config": len(pdf_service.field_mapping),
-              "fields": fields,
-        }
+            "pdf_path": service.pdf_path,
+            "template_version": template.version,
+            "total_pdf_fields": len(catalogue.fields),
+            "mapped_in_config": len(service.field_mapping),
+            "coverage": {
+                "mapped_fields": coverage["mapped_fields"],
+                "unmapped_fields": len(coverage["unmapped_fields"]),
+                "unresolved_keys": len(coverage["unresolved_keys"]),
+                "ambiguous_keys": len(coverage["ambiguous_keys"]),
+                "coverage": coverage["coverage"],
+            },
+            "matched": len(matched),
+            "offset": offset,
+            "limit": limit,
+            "next_offset": next_offset,
+            "fields": matched[offset : offset + limit],
+        },
+        headers={"ETag": etag},
+    )
+
+
+@router.get("/debug-pdf-fields/{form_id}/coverage")
+async def debug_pdf_field_coverage(form_id: str, http_request: Request):
+    """Full diff between the template's widgets and FIELD_MAPPING."""
+    try:
+        service, template, _, coverage = await run_in_threadpool(_field_catalogue, form_id)
     except (ValueError, FileNotFoundError) as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+
+    etag = f'"{service.form_id}-{template.version}-coverage"'
+    if _etag_matches(http_request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return JSONResponse(
+        {"form_id": form_id, "template_version": template.version, **coverage},
+        headers={"ETag": etag},
+    )
+
+
+@router.get("/debug-template-cache")
+async def debug_template_cache():
+    return {"templates": template_cache.stats(), "outputs": output_cache.stats()}
@@ -1,6 +1,7 @@
 # Background Removal API - remove.bg + rembg fallback
 from fastapi import APIRouter, UploadFile, File, Query
 from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
 
 from rembg import remove
 from rembg.session_factory import new_session
@@ -12,6 +13,8 @@ import os
 import traceback
 import httpx
 
+from app.core.admission import admission
+
 router = APIRouter()
 
 # ------------------------------
@@ -88,39 +91,51 @@ def _enhance_image(img_bgr: np.ndarray) -> np.ndarray:
     return cv2.bilateralFilter(img, d=5, sigmaColor=15, sigmaSpace=15)
 
 
-def _remove_bg_to_white_bg(input_bytes: bytes) -> np.ndarray:
-    """Remove background and composite on white using rembg."""
-    removed = remove(input_bytes, session=REMBG_SESSION)
-    img_rgba = Image.open(io.BytesIO(removed)).convert("RGBA")
+def _composite_on_white(transparent_png: bytes) -> np.ndarray:
+    """Flatten a transparent PNG onto white and return it as BGR."""
+    img_rgba = Image.open(io.BytesIO(transparent_png)).convert("RGBA")
     white_bg = Image.new("RGB", img_rgba.size, (255, 255, 255))
     white_bg.paste(img_rgba, mask=img_rgba.split()[3])
     return cv2.cvtColor(np.array(white_bg), cv2.COLOR_RGB2BGR)
 
 
+def _remove_bg_to_white_bg(input_bytes: bytes) -> np.ndarray:
+    """Remove background and composite on white using rembg."""
+    return _composite_on_white(remove(input_bytes, session=REMBG_SESSION))
+
+
+def _finish_photo(img_bgr: np.ndarray, width: int, height: int, quality: int = None) -> bytes:
+    """Face crop, enhance and JPEG-encode."""
+    result = _face_center_crop(img_bgr, width, height)
+    result = _enhance_image(result)
+    params = [cv2.IMWRITE_JPEG_QUALITY, quality] if quality is not None else []
+    _, buffer = cv2.imencode(".jpg", result, params)
+    return buffer.tobytes()
+
+
+# The image work below is CPU-bound, so it runs in the threadpool; admission
+# slots cap how many run at once (rembg holds a lot of memory per image).
+
 @router.post("/remove-bg")
 async def remove_bg(file: UploadFile = File(...)):
     """Simple background removal - returns cropped and enhanced image."""
     input_image = await file.read()
 
-    if REMOVE_BG_API_KEY:
-        try:
-            transparent_png = await remove_bg_with_api(input_image)
-            img_rgba = Image.open(io.BytesIO(transparent_png)).convert("RGBA")
-            white_bg = Image.new("RGB", img_rgba.size, (255, 255, 255))
-            white_bg.paste(img_rgba, mask=img_rgba.split()[3])
-            img_bgr = cv2.cvtColor(np.array(white_bg), cv2.COLOR_RGB2BGR)
-        except Exception as e:
-            print(f"[REMOVE.BG] API failed, using fallback: {e}")
-            img_bgr = _remove_bg_to_white_bg(input_image)
-    else:
-        img_bgr = _remove_bg_to_white_bg(input_image)
+    async with admission.slot("remove-bg"):
+        img_bgr = None
+        if REMOVE_BG_API_KEY:
+            try:
+                transparent_png = await remove_bg_with_api(input_image)
+                img_bgr = await run_in_threadpool(_composite_on_white, transparent_png)
+            except Exception as e:
+                print(f"[REMOVE.BG] API failed, using fallback: {e}")
+        if img_bgr is None:
+            img_bgr = await run_in_threadpool(_remove_bg_to_white_bg, input_image)
 
-    # Face detection and crop
-    result = _face_center_crop(img_bgr, 600, 600)
-    result = _enhance_image(result)
+        # Face detection and crop
+        content = await run_in_threadpool(_finish_photo, img_bgr, 600, 600)
 
-    _, buffer = cv2.imencode(".jpg", result)
-    return Response(content=buffer.tobytes(), media_type="image/jpeg")
+    return Response(content=content, media_type="image/jpeg")
 
 
 @router.post("/passport-photo")
@@ -138,37 +153,32 @@ async def create_passport_photo(
     - Customizable size
     """
     input_bytes = await file.read()
-    result_bgr = None
-
-    # Try remove.bg API first
-    if REMOVE_BG_API_KEY:
-        try:
-            print("[PASSPORT] Using remove.bg API...")
-            transparent_png = await remove_bg_with_api(input_bytes)
-            img_rgba = Image.open(io.BytesIO(transparent_png)).convert("RGBA")
-            white_bg = Image.new("RGB", img_rgba.size, (255, 255, 255))
-            white_bg.paste(img_rgba, mask=img_rgba.split()[3])
-            result_bgr = cv2.cvtColor(np.array(white_bg), cv2.COLOR_RGB2BGR)
-            print("[PASSPORT] remove.bg API success!")
-        except Exception as e:
-            print(f"[PASSPORT] remove.bg API failed: {e}")
-
-    # Fallback to rembg
-    if result_bgr is None:
-        print("[PASSPORT] Using rembg fallback...")
-        result_bgr = _remove_bg_to_white_bg(input_bytes)
-
-    # Face detection and centering
-    result_bgr = _face_center_crop(result_bgr, width, height)
-
-    # Enhancement
-    result_bgr = _enhance_image(result_bgr)
-
-    # JPEG encode
-    _, buffer = cv2.imencode(".jpg", result_bgr, [cv2.IMWRITE_JPEG_QUALITY, quality])
+
+    async with admission.slot("passport-photo"):
+        result_bgr = None
+
+        # Try remove.bg API first
+        if REMOVE_BG_API_KEY:
+            try:
+                print("[PASSPORT] Using remove.bg API...")
+                transparent_png = await remove_bg_with_api(input_bytes)
+                result_bgr = await run_in_threadpool(_composite_on_white, transparent_png)
+                print("[PASSPORT] remove.bg API success!")
+            except Exception as e:
+                print(f"[PASSPORT] remove.bg API failed: {e}")
+
+        # Fallback to rembg
+        if result_bgr is None:
+            print("[PASSPORT] Using rembg fallback...")
+            result_bgr = await run_in_threadpool(_remove_bg_to_white_bg, input_bytes)
+
+        # Face detection and centering, enhancement, JPEG encode
+        content = await run_in_threadpool(_finish_photo, result_bgr, width, height, quality)
 
     return Response(
-        content=buffer.tobytes(),
+        content=content,
         media_type="image/jpeg",
-        headers={"Content-Disposition": f"attachment; filename=passport_photo_{width}x{height}.jpg"}
+        headers={
+            "Content-Disposition": f"attachment; filename=passport_photo_{width}x{height}.jpg"
+        },
     )
@@ -0,0 +1,122 @@
+# backend/app/core/admission.py
+import math
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Tuple
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# endpoint → (max concurrent, max waiting); ADMISSION_LIMITS overrides any of them
+DEFAULT_LIMITS: Dict[str, Tuple[int, int]] = {
+    "fill-pdf": (settings.PDF_POOL_WORKERS, settings.PDF_POOL_QUEUE_DEPTH),
+    "preview": (settings.PDF_POOL_WORKERS, settings.PDF_POOL_QUEUE_DEPTH),
+    "compress": (2, 4),
+    "remove-bg": (1, 4),
+    "passport-photo": (1, 4),
+}
+
+
+class Overloaded(HTTPException):
+    """503 with Retry-After; raised when an endpoint's wait queue is full or the wait times out."""
+
+    def __init__(self, endpoint: str, retry_after: int):
+        super().__init__(
+            status_code=503,
+            detail=f"Server busy ({endpoint}), please retry",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class Limiter:
+    """Concurrency limit plus a bounded FIFO of waiters for one endpoint."""
+
+    def __init__(self, name: str, limit: int, max_waiting: int, max_wait_seconds: float):
+        self.name = name
+        self.limit = max(1, limit)
+        self.max_waiting = max(0, max_waiting)
+        self.max_wait_seconds = max_wait_seconds
+        self.active = 0
+        self.waiting = 0
+        self._sem = asyncio.Semaphore(self.limit)
+        self._avg_hold = 1.0  # seconds, moving average of how long a slot is held
+
+    def retry_after(self) -> int:
+        # Roughly when the current queue should have drained
+        backlog = (self.waiting + 1) / self.limit
+        return max(1, min(60, math.ceil(backlog * self._avg_hold)))
+
+    @asynccontextmanager
+    async def slot(self):
+        started = time.perf_counter()
+        if not self._sem.locked():
+            await self._sem.acquire()  # free slot: returns without suspending
+        else:
+            if self.waiting >= self.max_waiting:
+                metrics.incr(f"admission.{self.name}.rejected")
+                raise Overloaded(self.name, self.retry_after())
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._sem.acquire(), timeout=self.max_wait_seconds)
+            except asyncio.TimeoutError:
+                metrics.incr(f"admission.{self.name}.timed_out")
+                raise Overloaded(self.name, self.retry_after())
+            finally:
+                self.waiting -= 1
+        metrics.observe(f"admission.{self.name}.wait", (time.perf_counter() - started) * 1000)
+
+        self.active += 1
+        held = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._sem.release()
+            self._avg_hold = 0.8 * self._avg_hold + 0.2 * (time.perf_counter() - held)
+
+
+def _parse_limits(raw: str) -> Dict[str, Tuple[int, int]]:
+    """'compress=2:4,remove-bg=1' → {'compress': (2, 4), 'remove-bg': (1, DEFAULT waiting)}"""
+    limits = dict(DEFAULT_LIMITS)
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        try:
+            name, spec = item.split("=", 1)
+            concurrent, _, waiting = spec.partition(":")
+            name = name.strip()
+            default_waiting = limits.get(name, (1, 0))[1]
+            limits[name] = (int(concurrent), int(waiting) if waiting else default_waiting)
+        except ValueError:
+            logger.warning(f"Ignoring malformed ADMISSION_LIMITS entry: {item!r}")
+    return limits
+
+
+class AdmissionController:
+    """Per-endpoint limiters for CPU/memory-heavy routes.
+
+    Usage: `async with admission.slot("compress"): ...`
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[int, int]], max_wait_seconds: float):
+        self.limiters = {
+            name: Limiter(name, concurrent, waiting, max_wait_seconds)
+            for name, (concurrent, waiting) in limits.items()
+        }
+        for name, limiter in self.limiters.items():
+            metrics.gauge(f"admission.{name}.active", lambda l=limiter: l.active)
+            metrics.gauge(f"admission.{name}.waiting", lambda l=limiter: l.waiting)
+            metrics.gauge(f"admission.{name}.limit", lambda l=limiter: l.limit)
+
+    def slot(self, endpoint: str):
+        return self.limiters[endpoint].slot()
+
+
+admission = AdmissionController(
+    limits=_parse_limits(settings.ADMISSION_LIMITS),
+    max_wait_seconds=settings.ADMISSION_MAX_WAIT_SECONDS,
+)
@@ -49,6 +49,65 @@ class Settings:
     # File size limits
     MAX_PDF_SIZE_MB: int = 50
     MAX_JSON_SIZE_MB: int = 10
+
+    # PDF form templates kept in memory (one per form)
+    TEMPLATE_CACHE_SIZE: int = int(os.getenv("TEMPLATE_CACHE_SIZE", "8"))
+    # Templates are loaded from preprocessed copies (XFA removed, objects deduplicated);
+    # see app/services/template_preprocess.py and scripts/preprocess_templates.py
+    TEMPLATE_PREPROCESS: bool = os.getenv("TEMPLATE_PREPROCESS", "1") == "1"
+    TEMPLATE_ARTIFACTS_DIR: str = os.getenv(
+        "TEMPLATE_ARTIFACTS_DIR", str(BASE_DIR / "pdfs" / "preprocessed")
+    )
+    # Compiled form-mapping artifacts (scripts/compile_form_artifacts.py)
+    FORM_ARTIFACTS_DIR: str = os.getenv("FORM_ARTIFACTS_DIR", str(BASE_DIR / "pdfs" / "compiled"))
+    # Default save profile for filled forms: full | fast
+    PDF_SAVE_PROFILE: str = os.getenv("PDF_SAVE_PROFILE", "full")
+    # How field appearances are produced: update | deferred | batched
+    PDF_APPEARANCE_MODE: str = os.getenv("PDF_APPEARANCE_MODE", "update")
+
+    # PDF generation process pool (requests beyond workers + queue depth get a 503)
+    PDF_POOL_WORKERS: int = int(os.getenv("PDF_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PDF_POOL_QUEUE_DEPTH: int = int(os.getenv("PDF_POOL_QUEUE_DEPTH", "16"))
+    MAX_BATCH_ITEMS: int = int(os.getenv("MAX_BATCH_ITEMS", "50"))
+    # Image recompression pool for /compress (PIL resize + JPEG encode scale with cores)
+    IMAGE_POOL_WORKERS: int = int(os.getenv("IMAGE_POOL_WORKERS", str(os.cpu_count() or 1)))
+    IMAGE_POOL_QUEUE_DEPTH: int = int(
+        os.getenv("IMAGE_POOL_QUEUE_DEPTH", str(4 * IMAGE_POOL_WORKERS))
+    )
+    # /compress works entirely in memory; uploads above this size are spooled through temp files
+    COMPRESS_SPOOL_THRESHOLD_MB: int = int(os.getenv("COMPRESS_SPOOL_THRESHOLD_MB", "32"))
+    # Decoded images kept in shared memory across target_size_kb passes
+    # (beyond it: re-decoded per pass)
+    COMPRESS_IMAGE_CACHE_MB: int = int(os.getenv("COMPRESS_IMAGE_CACHE_MB", "32"))
+    # Default /compress profile: screen | ebook | print | archive
+    COMPRESS_PROFILE: str = os.getenv("COMPRESS_PROFILE", "ebook")
+    # Forms to preload at startup (comma list, "all", or empty for fully lazy loading)
+    WARMUP_FORMS: str = os.getenv("WARMUP_FORMS", "")
+
+    # Admission control for heavy endpoints: "endpoint=concurrent:waiting,..." overrides
+    # the defaults in app/core/admission.py; waiters give up with a 503 after the max wait
+    ADMISSION_LIMITS: str = os.getenv("ADMISSION_LIMITS", "")
+    ADMISSION_MAX_WAIT_SECONDS: float = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "20"))
+
+    # Background fill jobs (/fill-jobs): SQLite store + result files, kept for TTL after finishing
+    FILL_JOBS_DIR: str = os.getenv("FILL_JOBS_DIR", str(BASE_DIR / ".cache" / "fill_jobs"))
+    FILL_JOBS_CONCURRENCY: int = int(os.getenv("FILL_JOBS_CONCURRENCY", str(PDF_POOL_WORKERS)))
+    FILL_JOBS_MAX_QUEUED: int = int(os.getenv("FILL_JOBS_MAX_QUEUED", "1000"))
+    FILL_JOBS_TTL_HOURS: int = int(os.getenv("FILL_JOBS_TTL_HOURS", "24"))
+
+    # Filled-PDF cache on local disk (0 MB disables it). Files hold applicant PII, so each is
+    # deleted TTL after it was written, hits or not (0: kept until evicted). Previews share the TTL
+    OUTPUT_CACHE_DIR: str = os.getenv("OUTPUT_CACHE_DIR", str(BASE_DIR / ".cache" / "filled_pdfs"))
+    OUTPUT_CACHE_MAX_MB: int = int(os.getenv("OUTPUT_CACHE_MAX_MB", "256"))
+    OUTPUT_CACHE_TTL_MINUTES: int = int(os.getenv("OUTPUT_CACHE_TTL_MINUTES", "60"))
+
+    # Page previews (/fill-pdf/preview): thumbnail resolution and their own disk cache
+    PREVIEW_DPI: int = int(os.getenv("PREVIEW_DPI", "48"))
+    PREVIEW_MAX_DPI: int = int(os.getenv("PREVIEW_MAX_DPI", "150"))
+    PREVIEW_MAX_PAGES: int = int(os.getenv("PREVIEW_MAX_PAGES", "20"))
+    PREVIEW_WEBP_QUALITY: int = int(os.getenv("PREVIEW_WEBP_QUALITY", "70"))
+    PREVIEW_CACHE_DIR: str = os.getenv("PREVIEW_CACHE_DIR", str(BASE_DIR / ".cache" / "previews"))
+    PREVIEW_CACHE_MAX_MB: int = int(os.getenv("PREVIEW_CACHE_MAX_MB", "64"))
     
     # FIX: Yeh method raw string ko Python List mein badlega
     def get_cors_origins(self) -> List[str]:
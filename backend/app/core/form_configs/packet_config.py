@@ -0,0 +1,176 @@
+# backend/app/core/form_configs/packet_config.py
+# Canonical applicant profile → per-form frontend keys, for /fill-packet.
+#
+# Profile keys are "<person>.<field>" (the request may also nest them:
+# {"petitioner": {"family_name": ...}}). Each entry maps a profile key to the
+# FIELD_MAPPING key it fills on each form. A dict value instead of a string is
+# a checkbox group: {profile value: form key}, and the matching box is ticked.
+
+# Spousal petition: I-130 + I-130A (beneficiary spouse) + I-864 (petitioner as sponsor)
+# + I-864A (household member joining the sponsor's income)
+DEFAULT_PACKET = ["i130", "i130a", "i864", "i864a"]
+
+PROFILE_FIELDS = {
+    # ============================================
+    # PETITIONER / SPONSOR
+    # ============================================
+    "petitioner.family_name": {"i130": "family_name", "i864": "sponsor_family_name"},
+    "petitioner.given_name": {"i130": "given_name", "i864": "sponsor_given_name"},
+    "petitioner.middle_name": {"i130": "middle_name", "i864": "sponsor_middle_name"},
+    "petitioner.a_number": {"i130": "a_number", "i864": "sponsor_alien_number"},
+    "petitioner.uscis_account": {"i130": "uscis_account", "i864": "sponsor_uscis_account"},
+    "petitioner.ssn": {"i130": "ssn", "i864": "sponsor_ssn"},
+    "petitioner.date_of_birth": {"i130": "date_of_birth", "i864": "sponsor_dob"},
+    "petitioner.city_of_birth": {"i130": "city_of_birth", "i864": "sponsor_city_of_birth"},
+    "petitioner.country_of_birth": {"i130": "country_of_birth"},
+    "petitioner.sex": {"i130": {"Male": "sex_Male", "Female": "sex_Female"}},
+    "petitioner.address.in_care_of": {"i130": "current_in_care_of", "i864": "sponsor_in_care_of"},
+    "petitioner.address.street": {"i130": "current_street", "i864": "sponsor_street"},
+    "petitioner.address.unit_type": {
+        "i130": {
+            "Apt": "current_unit_type_Apt",
+            "Ste": "current_unit_type_Ste",
+            "Flr": "current_unit_type_Flr",
+        },
+        "i864": {"Apt": "sponsor_unit_apt", "Ste": "sponsor_unit_ste", "Flr": "sponsor_unit_flr"},
+    },
+    "petitioner.address.unit_number": {
+        "i130": "current_unit_number",
+        "i864": "sponsor_unit_number",
+    },
+    "petitioner.address.city": {"i130": "current_city", "i864": "sponsor_city"},
+    "petitioner.address.state": {"i130": "current_state", "i864": "sponsor_state"},
+    "petitioner.address.zip": {"i130": "current_zip", "i864": "sponsor_zip"},
+    "petitioner.address.province": {"i130": "current_province", "i864": "sponsor_province"},
+    "petitioner.address.postal_code": {
+        "i130": "current_postal_code",
+        "i864": "sponsor_postal_code",
+    },
+    "petitioner.address.country": {"i130": "current_country", "i864": "sponsor_country"},
+    # ============================================
+    # BENEFICIARY / INTENDING IMMIGRANT
+    # ============================================
+    "beneficiary.family_name": {
+        "i130": "Pt4Line4a_FamilyName",
+        "i130a": "p1_family_name",
+        "i864": "immigrant_family_name",
+        "i864a": "pt5_l1a_familyname",
+    },
+    "beneficiary.given_name": {
+        "i130": "Pt4Line4b_GivenName",
+        "i130a": "p1_given_name",
+        "i864": "immigrant_given_name",
+        "i864a": "pt5_l1b_givenname",
+    },
+    "beneficiary.middle_name": {
+        "i130": "Pt4Line4c_MiddleName",
+        "i130a": "p1_middle_name",
+        "i864": "immigrant_middle_name",
+        "i864a": "pt5_l1c_middlename",
+    },
+    "beneficiary.a_number": {
+        "i130": "Pt4Line1_AlienNumber",
+        "i130a": "p1_alien_number",
+        "i864": "immigrant_alien_number",
+        "i864a": "pt5_l1e_anumber",
+    },
+    "beneficiary.uscis_account": {
+        "i130": "Pt4Line2_USCISOnlineActNumber",
+        "i130a": "p1_uscis_account",
+        "i864": "immigrant_uscis_account",
+        "i864a": "pt5_l1f_uscisacctnumber",
+    },
+    "beneficiary.ssn": {"i130": "Pt4Line3_SSN"},
+    "beneficiary.date_of_birth": {
+        "i130": "Pt4Line9_DateOfBirth",
+        "i864": "immigrant_dob",
+        "i864a": "pt5_l1d_dateofbirth",
+    },
+    "beneficiary.city_of_birth": {"i130": "Pt4Line7_CityTownOfBirth"},
+    "beneficiary.country_of_birth": {"i130": "Pt4Line8_CountryOfBirth"},
+    "beneficiary.sex": {"i130": {"Male": "Pt4Line9_Male", "Female": "Pt4Line9_Female"}},
+    "beneficiary.daytime_phone": {
+        "i130": "Pt4Line14_DaytimePhoneNumber",
+        "i864": "immigrant_daytime_phone",
+    },
+    "beneficiary.mobile_phone": {"i130": "Pt4Line15_MobilePhoneNumber"},
+    "beneficiary.email": {"i130": "Pt4Line16_EmailAddress"},
+    "beneficiary.address.in_care_of": {"i864": "immigrant_in_care_of"},
+    "beneficiary.address.street": {
+        "i130": "Pt4Line11_StreetNumberName",
+        "i130a": "p1_addr1_street",
+        "i864": "immigrant_street",
+    },
+    "beneficiary.address.unit_type": {
+        "i130": {
+            "Apt": "Pt4Line11_Unit_Apt",
+            "Ste": "Pt4Line11_Unit_Ste",
+            "Flr": "Pt4Line11_Unit_Flr",
+        },
+        "i130a": {
+            "Apt": "p1_addr1_unit_apt",
+            "Ste": "p1_addr1_unit_ste",
+            "Flr": "p1_addr1_unit_flr",
+        },
+        "i864": {
+            "Apt": "immigrant_unit_apt",
+            "Ste": "immigrant_unit_ste",
+            "Flr": "immigrant_unit_flr",
+        },
+    },
+    "beneficiary.address.unit_number": {
+        "i130": "Pt4Line11_AptSteFlrNumber",
+        "i130a": "p1_addr1_unit_val",
+        "i864": "immigrant_unit_number",
+    },
+    "beneficiary.address.city": {
+        "i130": "Pt4Line11_CityOrTown",
+        "i130a": "p1_addr1_city",
+        "i864": "immigrant_city",
+    },
+    "beneficiary.address.state": {
+        "i130": "Pt4Line11_State",
+        "i130a": "p1_addr1_state",
+        "i864": "immigrant_state",
+    },
+    "beneficiary.address.zip": {
+        "i130": "Pt4Line11_ZipCode",
+        "i130a": "p1_addr1_zip",
+        "i864": "immigrant_zip",
+    },
+    "beneficiary.address.province": {
+        "i130": "Pt4Line11_Province",
+        "i130a": "p1_addr1_province",
+        "i864": "immigrant_province",
+    },
+    "beneficiary.address.postal_code": {
+        "i130": "Pt4Line11_PostalCode",
+        "i130a": "p1_addr1_postal",
+        "i864": "immigrant_postal_code",
+    },
+    "beneficiary.address.country": {
+        "i130": "Pt4Line11_Country",
+        "i130a": "p1_addr1_country",
+        "i864": "immigrant_country",
+    },
+    # ============================================
+    # HOUSEHOLD MEMBER (I-864A)
+    # ============================================
+    "household_member.family_name": {"i864a": "pt1_l1a_familyname"},
+    "household_member.given_name": {"i864a": "pt1_l1b_givenname"},
+    "household_member.middle_name": {"i864a": "pt1_l1c_middlename"},
+    "household_member.date_of_birth": {"i864a": "pt1_l5_dateofbirth"},
+    "household_member.country_of_birth": {"i864a": "pt1_l6_countryofbirth"},
+    "household_member.ssn": {"i864a": "pt1_l7_ssn"},
+    "household_member.a_number": {"i864a": "pt1_l8_aliennumber"},
+    "household_member.uscis_account": {"i864a": "pt1_l9_uscisonlineacctnumber"},
+    "household_member.address.in_care_of": {"i864a": "pt1_l2_incareofname"},
+    "household_member.address.street": {"i864a": "pt1_l2_streetnumbername"},
+    "household_member.address.unit_number": {"i864a": "pt1_l2_aptsteflrnumber"},
+    "household_member.address.city": {"i864a": "pt1_l2_cityortown"},
+    "household_member.address.state": {"i864a": "pt1_l2_state"},
+    "household_member.address.zip": {"i864a": "pt1_l2_zipcode"},
+    "household_member.address.province": {"i864a": "pt1_l2_province"},
+    "household_member.address.postal_code": {"i864a": "pt1_l2_postalcode"},
+    "household_member.address.country": {"i864a": "pt1_l2_country"},
+}
@@ -0,0 +1,135 @@
+# backend/app/core/metrics.py
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+# Histogram bucket upper bounds in milliseconds
+DEFAULT_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+
+class StageTimer:
+    """Per-request stage durations (ms) and counters. Plain dicts so it pickles across processes."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._last = time.perf_counter()
+
+    def mark(self):
+        """Start timing from now for the next lap()."""
+        self._last = time.perf_counter()
+
+    def lap(self, name: str):
+        """Charge the time since the previous mark()/lap() to stage `name`."""
+        now = time.perf_counter()
+        self.stages[name] = self.stages.get(name, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def count(self, name: str, n: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def as_dict(self) -> Dict[str, Dict]:
+        return {"stages": dict(self.stages), "counts": dict(self.counts)}
+
+
+def server_timing_header(stages: Dict[str, float]) -> str:
+    # https://www.w3.org/TR/server-timing/ : "name;dur=12.3, other;dur=4.5"
+    return ", ".join(f"{name.replace(' ', '_')};dur={ms:.1f}" for name, ms in stages.items())
+
+
+class Histogram:
+    def __init__(self, buckets: List[float] = None):
+        self.buckets = buckets or DEFAULT_BUCKETS_MS
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket containing the q-th observation."""
+        if not self.total:
+            return None
+        rank = q * self.total
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.total,
+            "sum_ms": round(self.sum, 1),
+            "avg_ms": round(self.sum / self.total, 1) if self.total else None,
+            "max_ms": round(self.max, 1),
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "buckets": {
+                **{f"le_{b}": c for b, c in zip(self.buckets, self.counts)},
+                "le_inf": self.counts[-1],
+            },
+        }
+
+
+class MetricsRegistry:
+    """In-process histograms, counters and gauges, read by GET /api/v1/metrics."""
+
+    def __init__(self):
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, Callable[[], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value_ms: float):
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram()
+            hist.observe(value_ms)
+
+    def incr(self, name: str, n: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def gauge(self, name: str, fn: Callable[[], float]):
+        """Register a gauge whose value is read when the metrics are collected."""
+        self._gauges[name] = fn
+
+    def record(self, prefix: str, timings: Dict[str, Dict]):
+        """Fold one StageTimer.as_dict() into `<prefix>.<stage>` histograms and counters."""
+        for stage, ms in timings.get("stages", {}).items():
+            self.observe(f"{prefix}.{stage}", ms)
+        for name, n in timings.get("counts", {}).items():
+            self.incr(f"{prefix}.{name}", n)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            histograms = {name: h.snapshot() for name, h in sorted(self._histograms.items())}
+            counters = dict(sorted(self._counters.items()))
+        gauges = {}
+        for name, fn in sorted(self._gauges.items()):
+            try:
+                gauges[name] = fn()
+            except Exception:
+                gauges[name] = None
+        return {"histograms": histograms, "counters": counters, "gauges": gauges}
+
+
+metrics = MetricsRegistry()
@@ -5,10 +5,14 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT, TA_RIGHT
 
+from app.core.metrics import StageTimer
+
 class AuthorityLetterGeneratorService:
     def __init__(self):
+        self.timer = StageTimer()
         self.styles = getSampleStyleSheet()
         self.setup_custom_styles()
+        self.timer.lap("setup")
 
     def setup_custom_styles(self):
         self.base_style = ParagraphStyle(
@@ -56,6 +60,7 @@ class AuthorityLetterGeneratorService:
         )
 
     def generate_pdf(self, form_data: dict) -> io.BytesIO:
+        self.timer.mark()
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(
             buffer, 
@@ -140,6 +145,8 @@ class AuthorityLetterGeneratorService:
         
         flowables.append(Paragraph(sig_text, self.signature_block_style))
 
+        self.timer.lap("layout")
         doc.build(flowables)
+        self.timer.lap("build")
         buffer.seek(0)
         return buffer
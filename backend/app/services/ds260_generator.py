@@ -6,6 +6,7 @@ from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Flowable
 from app.core.form_configs import ds260_config
+from app.core.metrics import StageTimer
 
 class BookmarkFlowable(Flowable):
     def __init__(self, title, key):
@@ -21,8 +22,10 @@ class BookmarkFlowable(Flowable):
 class DS260GeneratorService:
     def __init__(self):
         self.question_mapping = ds260_config.FIELD_MAPPING
+        self.timer = StageTimer()
 
     def generate_pdf(self, form_data: dict) -> io.BytesIO:
+        self.timer.mark()
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
         styles = getSampleStyleSheet()
@@ -98,7 +101,12 @@ class DS260GeneratorService:
             
             flowables.append(Paragraph(q_text, question_style))
             flowables.append(Paragraph(a_text, answer_style))
+            if val:
+                self.timer.count("filled")
+            else:
+                self.timer.count("unfilled")
             
+        self.timer.lap("layout")
         try:
             doc.build(flowables)
         except Exception as e:
@@ -106,6 +114,7 @@ class DS260GeneratorService:
             c = canvas.Canvas(buffer, pagesize=letter)
             c.drawString(100, 750, "Error generating PDF: " + str(e))
             c.save()
+        self.timer.lap("build")
 
         buffer.seek(0)
         return buffer
@@ -0,0 +1,95 @@
+# backend/app/services/field_catalogue.py
+import fnmatch
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import fitz
+
+
+class FieldCatalogue:
+    """Every widget of a template as plain dicts, extracted once per template version.
+
+    Stored on the TemplateEntry (derive "field_catalogue"), so debug/admin
+    endpoints can filter and page through it without reopening the PDF.
+    """
+
+    def __init__(self, doc: fitz.Document):
+        self.fields: List[Dict[str, Any]] = [
+            {
+                "page": page_num + 1,
+                "name": w.field_name,
+                "type": w.field_type_string,
+                "value": w.field_value,
+                "rect": list(w.rect),
+            }
+            for page_num, page in enumerate(doc)
+            for w in page.widgets()
+        ]
+        self.page_count = doc.page_count
+        self._coverage: Dict[str, Dict[str, Any]] = {}
+        self._mapped: Dict[str, frozenset] = {}
+        self._lock = threading.Lock()
+
+    def coverage(self, form_id: str, field_mapping: Dict[str, str], index) -> Dict[str, Any]:
+        """Template widgets vs FIELD_MAPPING, computed once per form from its WidgetIndex."""
+        cached = self._coverage.get(form_id)
+        if cached is not None:
+            return cached
+        with self._lock:
+            if form_id not in self._coverage:
+                resolved, ambiguous = index.bind(form_id, field_mapping)
+                mapped_names = {ref.field_name for refs in resolved.values() for ref in refs}
+                widget_names = list(dict.fromkeys(f["name"] for f in self.fields))
+                unmapped = [name for name in widget_names if name not in mapped_names]
+                unresolved = [
+                    key for key in field_mapping if key not in resolved and key not in ambiguous
+                ]
+                self._mapped[form_id] = frozenset(mapped_names)
+                self._coverage[form_id] = {
+                    "pdf_fields": len(widget_names),
+                    "mapped_fields": len(mapped_names),
+                    "unmapped_fields": unmapped,
+                    "config_keys": len(field_mapping),
+                    "resolved_keys": len(resolved),
+                    "unresolved_keys": unresolved,
+                    "ambiguous_keys": ambiguous,
+                    "coverage": (
+                        round(len(mapped_names) / len(widget_names), 4) if widget_names else 0.0
+                    ),
+                }
+            return self._coverage[form_id]
+
+    def mapped_names(self, form_id: str) -> frozenset:
+        """PDF field names filled by form_id's mapping (call coverage() first)."""
+        return self._mapped.get(form_id, frozenset())
+
+    def query(
+        self,
+        page: Optional[int] = None,
+        field_type: Optional[str] = None,
+        name: Optional[Callable[[str], bool]] = None,
+        mapped: Optional[bool] = None,
+        mapped_names: frozenset = frozenset(),
+    ) -> List[Dict[str, Any]]:
+        field_type = field_type.lower() if field_type else None
+        return [
+            f
+            for f in self.fields
+            if (page is None or f["page"] == page)
+            and (field_type is None or f["type"].lower() == field_type)
+            and (name is None or name(f["name"]))
+            and (mapped is None or (f["name"] in mapped_names) == mapped)
+        ]
+
+
+def name_matcher(pattern: Optional[str]) -> Optional[Callable[[str], bool]]:
+    """Case-insensitive field-name filter: a glob if pattern has * ? or [, else a substring.
+
+    No regex: the pattern comes from a query parameter.
+    """
+    if not pattern:
+        return None
+    pattern = pattern.lower()
+    if any(c in pattern for c in "*?["):
+        return lambda name: fnmatch.fnmatchcase(name.lower(), pattern)
+    return lambda name: pattern in name.lower()
@@ -0,0 +1,290 @@
+# backend/app/services/field_converters.py
+"""Per-field value converters, built once per (template, form) from the widget index.
+
+fill_pdf runs every submitted value through its field's converter before the
+document is opened, so the widget loops only ever see final values. Known
+formats (ISO dates, A-numbers, ZIP+4, state names) are normalized to what the
+template expects; a value that still doesn't fit is written as given and
+reported as a warning. Only values that cannot be written at all reject the
+payload. The same pass produces the FillReport returned by /fill-pdf/validate
+and the X-Fill-Report header.
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import fitz
+
+CHECKED_VALUES = frozenset(["yes", "y", "true", "1", "on"])
+UNCHECKED_VALUES = frozenset(["no", "false", "0", "off", "n"])
+
+BUTTON_TYPES = (fitz.PDF_WIDGET_TYPE_CHECKBOX, fitz.PDF_WIDGET_TYPE_RADIOBUTTON)
+CHOICE_TYPES = (fitz.PDF_WIDGET_TYPE_COMBOBOX, fitz.PDF_WIDGET_TYPE_LISTBOX)
+
+KIND_TEXT, KIND_BUTTON, KIND_CHOICE = "text", "button", "choice"
+FORMAT_DATE, FORMAT_A_NUMBER, FORMAT_ZIP = "date", "a_number", "zip"
+
+# USCIS date fields are all mm/dd/yyyy; browsers' <input type="date"> sends ISO
+DATE_FORMAT = "%m/%d/%Y"
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_COMB_SEPARATORS = re.compile(r"[\s\-./()]")
+# Text formats, recognized from the widget's own name (last component)
+_FIELD_FORMATS = (
+    (FORMAT_A_NUMBER, re.compile(r"alien|a_?number", re.IGNORECASE)),
+    (FORMAT_ZIP, re.compile(r"zip", re.IGNORECASE)),
+    (FORMAT_DATE, re.compile(r"date|dob", re.IGNORECASE)),
+)
+_A_NUMBER = re.compile(r"^A?(\d{7,9})$", re.IGNORECASE)
+_ZIP_PLUS_4 = re.compile(r"^(\d{5})[\s-]?\d{4}$")
+
+# USCIS state combos list two-letter codes; the frontend collects full names
+US_STATES = {
+    "alabama": "AL",
+    "alaska": "AK",
+    "arizona": "AZ",
+    "arkansas": "AR",
+    "california": "CA",
+    "colorado": "CO",
+    "connecticut": "CT",
+    "delaware": "DE",
+    "district of columbia": "DC",
+    "florida": "FL",
+    "georgia": "GA",
+    "hawaii": "HI",
+    "idaho": "ID",
+    "illinois": "IL",
+    "indiana": "IN",
+    "iowa": "IA",
+    "kansas": "KS",
+    "kentucky": "KY",
+    "louisiana": "LA",
+    "maine": "ME",
+    "maryland": "MD",
+    "massachusetts": "MA",
+    "michigan": "MI",
+    "minnesota": "MN",
+    "mississippi": "MS",
+    "missouri": "MO",
+    "montana": "MT",
+    "nebraska": "NE",
+    "nevada": "NV",
+    "new hampshire": "NH",
+    "new jersey": "NJ",
+    "new mexico": "NM",
+    "new york": "NY",
+    "north carolina": "NC",
+    "north dakota": "ND",
+    "ohio": "OH",
+    "oklahoma": "OK",
+    "oregon": "OR",
+    "pennsylvania": "PA",
+    "rhode island": "RI",
+    "south carolina": "SC",
+    "south dakota": "SD",
+    "tennessee": "TN",
+    "texas": "TX",
+    "utah": "UT",
+    "vermont": "VT",
+    "virginia": "VA",
+    "washington": "WA",
+    "west virginia": "WV",
+    "wisconsin": "WI",
+    "wyoming": "WY",
+    "american samoa": "AS",
+    "guam": "GU",
+    "northern mariana islands": "MP",
+    "puerto rico": "PR",
+    "virgin islands": "VI",
+    "u.s. virgin islands": "VI",
+}
+
+
+class FormDataError(ValueError):
+    """Payload values that cannot be written at all; `errors` maps frontend key → reason.
+
+    `report` is the full FillReport.as_dict() when the error came from validation;
+    `form_id` names the form when several are filled together (/fill-packet).
+    """
+
+    def __init__(
+        self,
+        errors: Dict[str, str],
+        report: Optional[Dict[str, Any]] = None,
+        form_id: Optional[str] = None,
+    ):
+        self.errors = errors
+        self.report = report
+        self.form_id = form_id
+        preview = "; ".join(f"{key}: {reason}" for key, reason in list(errors.items())[:5])
+        more = f" (+{len(errors) - 5} more)" if len(errors) > 5 else ""
+        prefix = f"{form_id}: " if form_id else ""
+        super().__init__(f"{prefix}Invalid form data: {preview}{more}")
+
+    def __reduce__(self):
+        # Crosses the worker-process boundary intact
+        return (FormDataError, (self.errors, self.report, self.form_id))
+
+
+class FieldConverter(NamedTuple):
+    kind: str
+    on_state: str = ""  # buttons: export name the widget is switched to when checked
+    max_len: int = 0  # text: /MaxLen, 0 = unlimited
+    comb: bool = False  # text: one character per box; separators are dropped to fit
+    # text: FORMAT_DATE / FORMAT_A_NUMBER / FORMAT_ZIP, normalized before the length check
+    format: str = ""
+    choices: Optional[Dict[str, str]] = None  # choice: stripped, casefolded option → option
+
+
+def converter_for(refs) -> FieldConverter:
+    """Converter for one frontend key from the widgets it fills (first widget decides the type)."""
+    first = refs[0]
+    if first.field_type in BUTTON_TYPES:
+        return FieldConverter(KIND_BUTTON, on_state=first.on_state)
+    if first.field_type in CHOICE_TYPES and first.choices:
+        return FieldConverter(KIND_CHOICE, choices={c.strip().casefold(): c for c in first.choices})
+    limits = [r.max_len for r in refs if r.max_len]
+    leaf = first.field_name.split(".")[-1]
+    return FieldConverter(
+        KIND_TEXT,
+        max_len=min(limits) if limits else 0,
+        comb=any(r.comb for r in refs),
+        format=next((fmt for fmt, pattern in _FIELD_FORMATS if pattern.search(leaf)), ""),
+    )
+
+
+def build_converters(resolved: Dict[str, Tuple]) -> Dict[str, FieldConverter]:
+    return {key: converter_for(refs) for key, refs in resolved.items()}
+
+
+def normalize(conv: FieldConverter, text: str) -> str:
+    """Rewrite a known text format into the form the template expects; other text is unchanged."""
+    if conv.format == FORMAT_DATE and _ISO_DATE.match(text):
+        try:
+            return datetime.strptime(text, "%Y-%m-%d").strftime(DATE_FORMAT)
+        except ValueError:
+            return text
+    if conv.format == FORMAT_A_NUMBER:
+        match = _A_NUMBER.match(re.sub(r"[\s\-]", "", text))
+        # Nine digits, zero-padded as the USCIS instructions ask
+        return match.group(1).zfill(9) if match else text
+    if conv.format == FORMAT_ZIP and conv.max_len and len(text) > conv.max_len:
+        match = _ZIP_PLUS_4.match(text)
+        return match.group(1) if match else text
+    return text
+
+
+def convert(conv: FieldConverter, value: Any) -> Tuple[Union[str, bool], Optional[str]]:
+    """(final value, warning) for one field.
+
+    A warning means the value is written anyway (as the template would take it
+    unconverted) but probably won't show as intended. Raises ValueError with a
+    user-facing reason only for values that cannot be written at all.
+    """
+    if isinstance(value, (dict, list)):
+        raise ValueError("expected a single value")
+
+    if conv.kind == KIND_BUTTON:
+        if isinstance(value, bool):
+            return value, None
+        text = str(value).strip().lower()
+        if text in CHECKED_VALUES or text == conv.on_state.lower():
+            return True, None
+        if text in UNCHECKED_VALUES or not text:
+            return False, None
+        return False, f"'{value}' is not a checkbox value (use yes/no); left unchecked"
+
+    text = str(value).strip()
+    if conv.kind == KIND_CHOICE:
+        option = conv.choices.get(text.casefold())
+        if option is None:
+            state = US_STATES.get(text.casefold())
+            option = conv.choices.get(state.casefold()) if state else None
+        if option is None:
+            options = [c for c in conv.choices.values() if c.strip()]
+            return (
+                text,
+                f"'{text}' is not one of {options[:10]}{' ...' if len(options) > 10 else ''}",
+            )
+        return option, None
+
+    text = normalize(conv, text)
+    if conv.max_len and len(text) > conv.max_len:
+        if conv.comb:
+            text = _COMB_SEPARATORS.sub("", text)
+        if len(text) > conv.max_len:
+            return text, f"longer than {conv.max_len} characters; the form may cut it off"
+    return text, None
+
+
+def _is_blank(value: Any) -> bool:
+    return not value or (isinstance(value, str) and not value.strip())
+
+
+class FillReport(NamedTuple):
+    """What a fill would do with a payload, worked out from the mapping alone."""
+
+    filled: List[str]  # keys that will be written
+    unmapped: List[str]  # not in the form's FIELD_MAPPING
+    unresolved: List[str]  # mapped, but no template widget matches
+    ambiguous: List[str]  # mapped, but the suffix matches several widgets
+    empty: List[str]  # blank values, skipped
+    invalid: Dict[str, str]  # key → reason the value cannot be written
+    warnings: Dict[str, str]  # key → why a written value may not show as intended
+
+    @property
+    def ok(self) -> bool:
+        return not self.invalid
+
+    def counts(self) -> Dict[str, int]:
+        return {name: len(getattr(self, name)) for name in self._fields}
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"ok": self.ok, "counts": self.counts(), **self._asdict()}
+
+    def header(self) -> str:
+        return report_header(self.counts())
+
+
+def report_header(counts: Dict[str, int]) -> str:
+    """Compact X-Fill-Report value: 'filled=120; unmapped=3; ...'"""
+    return "; ".join(f"{name}={count}" for name, count in counts.items())
+
+
+def validate_form_data(
+    form_data: Dict[str, Any],
+    field_mapping: Dict[str, str],
+    converters: Dict[str, FieldConverter],
+    ambiguous: Dict[str, List[str]],
+) -> Tuple[Dict[str, Union[str, bool]], FillReport]:
+    """One pass over the payload: (key → final value, report). Nothing here touches the PDF."""
+    keys = form_data.keys()
+    mapped = keys & field_mapping.keys()
+    missing = mapped - converters.keys()
+    skipped = {key for key in mapped - missing if _is_blank(form_data[key])}
+
+    values: Dict[str, Union[str, bool]] = {}
+    invalid: Dict[str, str] = {}
+    warnings: Dict[str, str] = {}
+    writable = mapped - missing - skipped
+    for key in form_data:  # payload order, so widgets are written in a stable order
+        if key not in writable:
+            continue
+        try:
+            values[key], warning = convert(converters[key], form_data[key])
+        except ValueError as e:
+            invalid[key] = str(e)
+            continue
+        if warning:
+            warnings[key] = warning
+
+    report = FillReport(
+        filled=sorted(values),
+        unmapped=sorted(keys - field_mapping.keys()),
+        unresolved=sorted(missing - ambiguous.keys()),
+        ambiguous=sorted(missing & ambiguous.keys()),
+        empty=sorted(skipped),
+        invalid=dict(sorted(invalid.items())),
+        warnings=dict(sorted(warnings.items())),
+    )
+    return values, report
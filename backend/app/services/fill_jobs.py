@@ -0,0 +1,307 @@
+# backend/app/services/fill_jobs.py
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+import sqlite3
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.pdf_workers import pdf_pool, render_form, PoolSaturated
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+# Runs per job when the worker process dies under it, counted across restarts
+MAX_ATTEMPTS = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fill_jobs (
+    id TEXT PRIMARY KEY,
+    form_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    size INTEGER,
+    timings TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS fill_jobs_status ON fill_jobs (status, created_at);
+"""
+
+
+class QueueFull(Exception):
+    """Raised when too many jobs are already waiting."""
+
+
+class JobStore:
+    """SQLite record of every job; results live next to it as <id>.pdf files."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "jobs.sqlite3"), check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def result_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.pdf")
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params)
+
+    def insert(self, job_id: str, form_id: str, data: Dict[str, Any], options: Dict[str, Any]):
+        self._execute(
+            "INSERT INTO fill_jobs (id, form_id, data, options, status, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                job_id,
+                form_id,
+                json.dumps(data, default=str),
+                json.dumps(options),
+                QUEUED,
+                time.time(),
+            ),
+        )
+
+    def get(self, job_id: str) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute("SELECT * FROM fill_jobs WHERE id = ?", (job_id,)).fetchone()
+
+    def mark_running(self, job_id: str) -> int:
+        """Claim a job for a run; return how many runs it has had, this one included."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE fill_jobs SET status = ?, started_at = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (RUNNING, time.time(), job_id),
+            )
+            return self._conn.execute(
+                "SELECT attempts FROM fill_jobs WHERE id = ?", (job_id,)
+            ).fetchone()[0]
+
+    def mark_done(self, job_id: str, pdf: bytes, timings: Dict[str, Dict]):
+        # Result file first, so a job marked done always has one
+        path = self.result_path(job_id)
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(pdf)
+        os.replace(f"{path}.tmp", path)
+        self._execute(
+            "UPDATE fill_jobs SET status = ?, size = ?, timings = ?, finished_at = ? WHERE id = ?",
+            (DONE, len(pdf), json.dumps(timings), time.time(), job_id),
+        )
+
+    def mark_failed(self, job_id: str, error: str):
+        self._execute(
+            "UPDATE fill_jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+            (FAILED, error, time.time(), job_id),
+        )
+
+    def requeue_interrupted(self) -> List[str]:
+        """Put jobs a previous process was running back in the queue.
+
+        Returns all queued ids, oldest first.
+        A job that has already been claimed MAX_ATTEMPTS times is failed instead,
+        so one that takes the whole process down can't crash-loop every restart.
+        """
+        self._execute(
+            "UPDATE fill_jobs SET status = ?, error = ?, finished_at = ? "
+            "WHERE status = ? AND attempts >= ?",
+            (FAILED, "Interrupted too many times", time.time(), RUNNING, MAX_ATTEMPTS),
+        )
+        self._execute(
+            "UPDATE fill_jobs SET status = ?, started_at = NULL WHERE status = ?", (QUEUED, RUNNING)
+        )
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM fill_jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def purge(self, older_than: float) -> int:
+        """Delete finished jobs (and their files) that finished before `older_than`."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM fill_jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (DONE, FAILED, older_than),
+            ).fetchall()
+        for row in rows:
+            try:
+                os.unlink(self.result_path(row["id"]))
+            except OSError:
+                pass
+        self._execute(
+            "DELETE FROM fill_jobs WHERE status IN (?, ?) AND finished_at < ?",
+            (DONE, FAILED, older_than),
+        )
+        return len(rows)
+
+    def close(self):
+        self._conn.close()
+
+
+class FillJobQueue:
+    """Durable background queue for /fill-jobs, drained into the shared PDF worker pool.
+
+    Jobs are written to SQLite before they are acknowledged; on startup anything
+    still queued (or interrupted mid-run) is picked up again.
+    """
+
+    def __init__(self, directory: str, concurrency: int, max_queued: int, ttl_seconds: int):
+        self.directory = directory
+        self.concurrency = max(1, concurrency)
+        self.max_queued = max_queued
+        self.ttl_seconds = ttl_seconds
+        self.store: Optional[JobStore] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumers: List[asyncio.Task] = []
+        self._waiters: Dict[str, asyncio.Event] = {}
+        self._last_purge = 0.0
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        if self._consumers:
+            return
+        self.store = await asyncio.to_thread(JobStore, self.directory)
+        self._queue = asyncio.Queue()
+        pending = await asyncio.to_thread(self.store.requeue_interrupted)
+        for job_id in pending:
+            self._queue.put_nowait(job_id)
+        if pending:
+            logger.info(f"Resuming {len(pending)} queued fill jobs")
+        await self._purge()
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        # Unfinished jobs stay queued/running in the store and are resumed on next start
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    async def submit(self, form_id: str, data: Dict[str, Any], options: Dict[str, Any]) -> str:
+        if self.queued >= self.max_queued:
+            raise QueueFull(f"Fill job queue full ({self.queued}/{self.max_queued})")
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(self.store.insert, job_id, form_id, data, options)
+        self._queue.put_nowait(job_id)
+        metrics.incr("fill_jobs.submitted")
+        return job_id
+
+    async def get(self, job_id: str, wait: float = 0) -> Optional[Dict[str, Any]]:
+        """Job status; with wait > 0, hold the request until the job finishes or `wait` passes."""
+        row = await asyncio.to_thread(self.store.get, job_id)
+        if row is not None and wait > 0 and row["status"] in (QUEUED, RUNNING):
+            event = self._waiters.setdefault(job_id, asyncio.Event())
+            # Re-read after registering so a job finishing in between isn't missed
+            row = await asyncio.to_thread(self.store.get, job_id)
+            if row["status"] in (QUEUED, RUNNING):
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                row = await asyncio.to_thread(self.store.get, job_id)
+        return self._describe(row) if row is not None else None
+
+    def _describe(self, row: sqlite3.Row) -> Dict[str, Any]:
+        job = {
+            "jobId": row["id"],
+            "formId": row["form_id"],
+            "status": row["status"],
+            "createdAt": row["created_at"],
+            "startedAt": row["started_at"],
+            "finishedAt": row["finished_at"],
+        }
+        if row["status"] == DONE:
+            job["size"] = row["size"]
+        if row["status"] == FAILED:
+            job["error"] = row["error"]
+        return job
+
+    async def _consume(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Fill job {job_id} crashed the consumer: {e}")
+            finally:
+                self._queue.task_done()
+                event = self._waiters.pop(job_id, None)
+                if event is not None:
+                    event.set()
+            await self._purge()
+
+    async def _run(self, job_id: str):
+        row = await asyncio.to_thread(self.store.get, job_id)
+        if row is None or row["status"] != QUEUED:
+            return
+        attempts = await asyncio.to_thread(self.store.mark_running, job_id)
+        queued_ms = (time.time() - row["created_at"]) * 1000
+        args = (row["form_id"], json.loads(row["data"]), json.loads(row["options"]))
+        while True:
+            try:
+                result = await pdf_pool.run(render_form, *args)
+                break
+            except PoolSaturated:
+                # Interactive /fill-pdf traffic has the pool; jobs can wait their turn
+                await asyncio.sleep(1)
+            except BrokenProcessPool as e:
+                # The pool restarts itself; a worker crash may not be this job's fault
+                if attempts < MAX_ATTEMPTS:
+                    attempts = await asyncio.to_thread(self.store.mark_running, job_id)
+                    continue
+                await asyncio.to_thread(self.store.mark_failed, job_id, str(e))
+                metrics.incr("fill_jobs.failed")
+                return
+            except Exception as e:
+                await asyncio.to_thread(self.store.mark_failed, job_id, str(e))
+                metrics.incr("fill_jobs.failed")
+                logger.error(f"Fill job {job_id} ({row['form_id']}) failed: {e}")
+                return
+        await asyncio.to_thread(self.store.mark_done, job_id, result.pdf, result.timings)
+        metrics.observe("fill_jobs.queued", queued_ms)
+        metrics.record(f"fill_jobs.{row['form_id'].lower()}", result.timings)
+        metrics.incr("fill_jobs.done")
+
+    async def _purge(self):
+        now = time.time()
+        if now - self._last_purge < 600:
+            return
+        self._last_purge = now
+        removed = await asyncio.to_thread(self.store.purge, now - self.ttl_seconds)
+        if removed:
+            logger.info(f"Purged {removed} finished fill jobs")
+
+
+fill_jobs = FillJobQueue(
+    directory=settings.FILL_JOBS_DIR,
+    concurrency=settings.FILL_JOBS_CONCURRENCY,
+    max_queued=settings.FILL_JOBS_MAX_QUEUED,
+    ttl_seconds=settings.FILL_JOBS_TTL_HOURS * 3600,
+)
+
+metrics.gauge("fill_jobs.queued", lambda: fill_jobs.queued)
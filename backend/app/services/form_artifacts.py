@@ -0,0 +1,239 @@
+# backend/app/services/form_artifacts.py
+"""Compiled form-mapping artifacts.
+
+Each artifact pairs one form's FIELD_MAPPING with the widgets of its template:
+every widget's name, type, page, xrefs, checkbox on-state, max length, comb
+flag and choice options, plus the frontend key → widget binding that
+WidgetIndex.bind would otherwise compute.
+Loading one is a single read and a few struct unpacks, so a cold worker never
+walks the PDF's widgets.
+
+Layout (little-endian):
+    header      MAGIC, version, template sha256, mapping digest, section counts
+    strings     (n_strings + 1) uint32 offsets into a UTF-8 blob, then the blob
+    widgets     n_widgets × WIDGET records (indices into the string table)
+    bindings    n_bindings × BINDING records, each a slice of `refs`
+    refs        uint32 widget indices (resolved keys) or string indices (ambiguous keys)
+
+Artifacts are built by scripts/compile_form_artifacts.py and ignored (with a
+fallback to the runtime scan) when the template bytes or the mapping change.
+"""
+
+import os
+import json
+import struct
+import hashlib
+import logging
+from typing import Dict, List, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"RFMA"
+FORMAT_VERSION = 2
+
+HEADER = struct.Struct("<4sHH32s16sIIIII")
+# name, on_state, choices, xref, field_xref, page, max_len, field_type, comb
+WIDGET = struct.Struct("<IIIIIHHBB")
+# Choice options are stored as one interned string
+CHOICE_SEP = "\x1f"
+# frontend key, kind, count, start
+BINDING = struct.Struct("<IBxHI")
+U32 = struct.Struct("<I")
+
+KIND_RESOLVED = 0
+KIND_AMBIGUOUS = 1
+
+
+class ArtifactError(Exception):
+    """Artifact missing, corrupt, or built from a different template/mapping."""
+
+
+def artifact_path(form_id: str) -> str:
+    return os.path.join(settings.FORM_ARTIFACTS_DIR, f"{form_id}.fma")
+
+
+def mapping_digest(field_mapping: Dict[str, str]) -> bytes:
+    payload = json.dumps(field_mapping, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).digest()[:16]
+
+
+def build_artifact(template_sha256: bytes, field_mapping: Dict[str, str], index) -> bytes:
+    """Serialize a WidgetIndex and its binding for field_mapping."""
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(text: str) -> int:
+        sid = string_ids.get(text)
+        if sid is None:
+            sid = string_ids[text] = len(strings)
+            strings.append(text)
+        return sid
+
+    widget_ids = {}
+    widget_records = []
+    for i, ref in enumerate(index.refs):
+        widget_ids[ref.xref] = i
+        widget_records.append(
+            WIDGET.pack(
+                intern(ref.field_name),
+                intern(ref.on_state),
+                intern(CHOICE_SEP.join(ref.choices)),
+                ref.xref,
+                ref.field_xref,
+                ref.page,
+                min(ref.max_len, 0xFFFF),
+                ref.field_type,
+                int(ref.comb),
+            )
+        )
+
+    resolved, ambiguous = index.bind("__compile__", field_mapping)
+    binding_records = []
+    refs: List[int] = []
+    for key, widgets in resolved.items():
+        binding_records.append(BINDING.pack(intern(key), KIND_RESOLVED, len(widgets), len(refs)))
+        refs.extend(widget_ids[w.xref] for w in widgets)
+    for key, names in ambiguous.items():
+        binding_records.append(BINDING.pack(intern(key), KIND_AMBIGUOUS, len(names), len(refs)))
+        refs.extend(intern(name) for name in names)
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = [0]
+    for chunk in encoded:
+        offsets.append(offsets[-1] + len(chunk))
+    blob = b"".join(encoded)
+
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        0,
+        template_sha256,
+        mapping_digest(field_mapping),
+        len(strings),
+        len(widget_records),
+        len(binding_records),
+        len(refs),
+        len(blob),
+    )
+    return b"".join(
+        [
+            header,
+            struct.pack(f"<{len(offsets)}I", *offsets),
+            blob,
+            *widget_records,
+            *binding_records,
+            struct.pack(f"<{len(refs)}I", *refs),
+        ]
+    )
+
+
+def parse_artifact(data: bytes, template_sha256: bytes, field_mapping: Dict[str, str]):
+    """Return (widget refs, resolved, ambiguous) or raise ArtifactError."""
+    # Imported here: pdf_filler imports this module
+    from app.services.pdf_filler import WidgetRef
+
+    if len(data) < HEADER.size:
+        raise ArtifactError("truncated header")
+    magic, version, _, sha, digest, n_strings, n_widgets, n_bindings, n_refs, blob_len = (
+        HEADER.unpack_from(data)
+    )
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ArtifactError(f"unsupported artifact (magic={magic!r}, version={version})")
+    if sha != template_sha256:
+        raise ArtifactError("template changed since the artifact was built")
+    if digest != mapping_digest(field_mapping):
+        raise ArtifactError("field mapping changed since the artifact was built")
+
+    view = memoryview(data)
+    pos = HEADER.size
+    offsets = struct.unpack_from(f"<{n_strings + 1}I", view, pos)
+    pos += 4 * (n_strings + 1)
+    blob = bytes(view[pos : pos + blob_len])
+    pos += blob_len
+    expected = pos + WIDGET.size * n_widgets + BINDING.size * n_bindings + 4 * n_refs
+    if len(data) != expected or offsets[-1] != blob_len:
+        raise ArtifactError("size mismatch")
+    strings = [blob[offsets[i] : offsets[i + 1]].decode("utf-8") for i in range(n_strings)]
+
+    rows = WIDGET.iter_unpack(view[pos : pos + WIDGET.size * n_widgets])
+    widgets = [
+        WidgetRef(
+            page,
+            xref,
+            field_type,
+            strings[name],
+            field_xref,
+            strings[on_state],
+            max_len,
+            bool(comb),
+            tuple(strings[choices].split(CHOICE_SEP)) if strings[choices] else (),
+        )
+        for name, on_state, choices, xref, field_xref, page, max_len, field_type, comb in rows
+    ]
+    pos += WIDGET.size * n_widgets
+    bindings = list(BINDING.iter_unpack(view[pos : pos + BINDING.size * n_bindings]))
+    pos += BINDING.size * n_bindings
+    refs = struct.unpack_from(f"<{n_refs}I", view, pos)
+
+    resolved: Dict[str, Tuple] = {}
+    ambiguous: Dict[str, List[str]] = {}
+    for key, kind, count, start in bindings:
+        ids = refs[start : start + count]
+        if kind == KIND_RESOLVED:
+            resolved[strings[key]] = tuple(widgets[i] for i in ids)
+        else:
+            ambiguous[strings[key]] = [strings[i] for i in ids]
+    return widgets, resolved, ambiguous
+
+
+def load_widget_index(form_id: str, field_mapping: Dict[str, str], template):
+    """TemplateEntry.derive loader: a WidgetIndex pre-bound for form_id.
+
+    Returns None to fall back to the scan.
+    """
+    from app.services.pdf_filler import WidgetIndex
+
+    path = artifact_path(form_id)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        widgets, resolved, ambiguous = parse_artifact(data, template.sha256, field_mapping)
+    except FileNotFoundError:
+        return None
+    except (ArtifactError, struct.error, UnicodeDecodeError, IndexError) as e:
+        logger.warning(
+            f"Ignoring form artifact {path}: {e}. Rebuild with scripts/compile_form_artifacts.py"
+        )
+        return None
+
+    index = WidgetIndex.from_refs(widgets)
+    index.preload(form_id, resolved, ambiguous)
+    logger.info(
+        f"Loaded form artifact for {form_id.upper()} ({len(widgets)} widgets, {len(resolved)} keys)"
+    )
+    return index
+
+
+def compile_form(form_id: str) -> Tuple[str, int]:
+    """Build and write the artifact for one form. Returns (path, size in bytes)."""
+    from app.services.pdf_filler import PDFFillerService, WidgetIndex
+    from app.services.template_cache import template_cache
+
+    service = PDFFillerService(form_id)
+    template = template_cache.get(service.pdf_path)
+    doc = template.open()
+    try:
+        index = WidgetIndex(doc)
+    finally:
+        doc.close()
+    data = build_artifact(template.sha256, service.field_mapping, index)
+
+    path = artifact_path(service.form_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path, len(data)
@@ -0,0 +1,118 @@
+# backend/app/services/form_registry.py
+import importlib
+import logging
+import threading
+from collections.abc import Mapping
+from typing import Dict, Iterable, Optional, Type
+
+logger = logging.getLogger(__name__)
+
+# formId → config module holding FIELD_MAPPING (AcroForm forms filled by PDFFillerService)
+FORM_CONFIG_MODULES = {
+    "i130": "app.core.form_configs.i130_config",
+    "i864": "app.core.form_configs.i864_config",
+    "i130a": "app.core.form_configs.i130a_config",
+    "i129f": "app.core.form_configs.i129f_config",
+    "i912": "app.core.form_configs.i912_config",
+    "i864a": "app.core.form_configs.i864a_config",
+    "i864ez": "app.core.form_configs.i864ez_config",
+    "i693": "app.core.form_configs.i693_config",
+    # "i485": "app.core.form_configs.i485_config",
+    # "i765": "app.core.form_configs.i765_config",
+}
+
+# formId → (module, class) for the ReportLab generators
+GENERATORS = {
+    "ds260": ("app.services.ds260_generator", "DS260GeneratorService"),
+    "police_verification": ("app.services.police_letter_generator", "PoliceLetterGeneratorService"),
+    "authority_letter": (
+        "app.services.authority_letter_generator",
+        "AuthorityLetterGeneratorService",
+    ),
+}
+
+_lock = threading.Lock()
+_generator_classes: Dict[str, Type] = {}
+
+
+class LazyFormConfigs(Mapping):
+    """Read-only formId → FIELD_MAPPING dict that imports each config on first access.
+
+    Membership tests and key listing never import anything, so a worker that
+    only serves /compress never loads the (large) mapping modules.
+    """
+
+    def __init__(self, modules: Dict[str, str]):
+        self._modules = modules
+        self._loaded: Dict[str, Dict[str, str]] = {}
+
+    def __getitem__(self, form_id: str) -> Dict[str, str]:
+        mapping = self._loaded.get(form_id)
+        if mapping is None:
+            module_name = self._modules[form_id]  # KeyError for unknown forms, like a dict
+            with _lock:
+                mapping = self._loaded.get(form_id)
+                if mapping is None:
+                    mapping = importlib.import_module(module_name).FIELD_MAPPING
+                    self._loaded[form_id] = mapping
+                    logger.info(f"Loaded form config: {form_id}")
+        return mapping
+
+    def __contains__(self, form_id) -> bool:
+        return form_id in self._modules
+
+    def __iter__(self):
+        return iter(self._modules)
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+    def loaded(self) -> Iterable[str]:
+        return list(self._loaded)
+
+    def load(self, form_ids: Iterable[str]):
+        """Import the configs for form_ids now; ids without one (generators, typos) are skipped."""
+        for form_id in form_ids:
+            if form_id in self._modules:
+                self[form_id]
+
+
+FORM_CONFIGS = LazyFormConfigs(FORM_CONFIG_MODULES)
+
+
+def get_generator(form_id: str) -> Optional[Type]:
+    """Generator class for formId (imported on first use), or None if it is an AcroForm form."""
+    key = form_id.lower()
+    if key not in GENERATORS:
+        return None
+    cls = _generator_classes.get(key)
+    if cls is None:
+        module_name, class_name = GENERATORS[key]
+        cls = getattr(importlib.import_module(module_name), class_name)
+        _generator_classes[key] = cls
+    return cls
+
+
+def parse_form_list(raw: str) -> list:
+    """'i130, i864' → ['i130', 'i864']; 'all' → every known form."""
+    names = [name.strip().lower() for name in raw.split(",") if name.strip()]
+    if "all" in names:
+        return list(FORM_CONFIG_MODULES) + list(GENERATORS)
+    return names
+
+
+def warmup(form_ids: Iterable[str], templates: bool = True):
+    """Load configs (and, with templates=True, template bytes + widget index) ahead of traffic."""
+    from app.services.pdf_filler import PDFFillerService
+    from app.services.template_cache import template_cache
+
+    for form_id in form_ids:
+        try:
+            if get_generator(form_id) is not None:
+                continue
+            service = PDFFillerService(form_id)
+            if templates:
+                index = service.widget_index(template_cache.get(service.pdf_path))
+                index.bind(service.form_id, service.field_mapping)
+        except Exception as e:
+            logger.warning(f"Warmup failed for {form_id}: {e}")
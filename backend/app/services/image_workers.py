@@ -0,0 +1,96 @@
+# backend/app/services/image_workers.py
+"""Image recompression for /compress on a long-lived process pool.
+
+The parent decodes each image once with MuPDF (JPEGs are passed through
+still encoded) into a shared-memory segment; workers attach to it by name,
+resize and JPEG-encode with PIL, and send back only the small encoded
+result. Nothing large is pickled, and PIL's GIL-bound work runs on every core.
+"""
+
+import io
+import logging
+from multiprocessing import shared_memory
+from typing import NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.services.pdf_workers import PDFWorkerPool
+
+logger = logging.getLogger(__name__)
+
+# Already-compressed JPEGs below this size are left alone
+SKIP_JPEG_BYTES = 50 * 1024
+
+
+class SharedImage(NamedTuple):
+    shm_name: str
+    nbytes: int
+    mode: str  # PIL raw mode ("L", "RGB") for decoded pixels; "" for encoded image bytes
+    size: Tuple[int, int]
+
+
+def share_image(doc, xref: int) -> Optional[Tuple[shared_memory.SharedMemory, SharedImage]]:
+    """Copy one image into a new shared-memory segment, or None to leave it as is.
+
+    Runs in the parent; the caller owns the segment and must close and unlink it.
+    """
+    import fitz
+
+    if doc.xref_get_key(xref, "Filter")[1] == "/DCTDecode":
+        # Still encoded; extract_image applies /Decode (inverted Adobe CMYK JPEGs)
+        extracted = doc.extract_image(xref)
+        if extracted["ext"].lower() in ("jpeg", "jpg") and extracted["size"] < SKIP_JPEG_BYTES:
+            return None
+        mode, size, pixels = "", (0, 0), extracted["image"]
+    else:
+        pix = fitz.Pixmap(doc, xref)
+        if pix.alpha:
+            pix = fitz.Pixmap(pix, 0)
+        if pix.n not in (1, 3):
+            pix = fitz.Pixmap(fitz.csRGB, pix)
+        mode, size, pixels = ("L" if pix.n == 1 else "RGB"), (pix.width, pix.height), pix.samples_mv
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(pixels)))
+    shm.buf[: len(pixels)] = pixels
+    return shm, SharedImage(shm.name, len(pixels), mode, size)
+
+
+def recompress_image(src: SharedImage, scale: float, quality: int) -> bytes:
+    """Downsample by `scale` (when below 1) and JPEG-encode one shared image.
+
+    Runs inside a worker process.
+    """
+    from PIL import Image
+
+    shm = shared_memory.SharedMemory(name=src.shm_name)
+    view = shm.buf[: src.nbytes]
+    try:
+        if src.mode:
+            # Zero-copy view of the parent's pixels
+            image = Image.frombuffer(src.mode, src.size, view, "raw", src.mode, 0, 1)
+        else:
+            image = Image.open(io.BytesIO(view))
+            image.load()
+
+        width, height = image.size
+        if scale < 1:
+            # Use LANCZOS for better quality at similar speed
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            image = image.resize(size, Image.Resampling.LANCZOS)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=quality, optimize=True)
+        return output.getvalue()
+    finally:
+        # Every image built on the buffer must be gone before the segment can be closed
+        image = None
+        view.release()
+        shm.close()
+
+
+image_pool = PDFWorkerPool(
+    workers=settings.IMAGE_POOL_WORKERS,
+    max_queue=settings.IMAGE_POOL_QUEUE_DEPTH,
+    name="Image worker pool",
+)
@@ -0,0 +1,209 @@
+# backend/app/services/output_cache.py
+import os
+import json
+import hashlib
+import logging
+import asyncio
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_form_data(form_data: Dict[str, Any], field_mapping: Dict[str, str]) -> Dict[str, Any]:
+    """Drop everything fill_pdf would ignore so equivalent payloads hash the same."""
+    return {
+        key: value
+        for key, value in form_data.items()
+        if key in field_mapping and str(value or "").strip()
+    }
+
+
+class OutputCache:
+    """Disk-backed, content-addressed cache of filled PDFs with size-bounded LRU eviction.
+
+    Files are named by the sha256 key. The mtime is the write time and the atime,
+    bumped on every hit, is the recency, so the LRU order survives restarts.
+
+    Filled forms carry applicant PII (SSNs, A-numbers), so with ttl_seconds set
+    every file is deleted that long after it was written, however often it was hit.
+    """
+
+    def __init__(
+        self, directory: str, max_bytes: int, suffix: str = ".pdf", ttl_seconds: float = 0
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.ttl_seconds = ttl_seconds
+        # key → (size, written at), least recently used first
+        self._index: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._total = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(
+        form_id: str, template_version: str, form_data: Dict[str, Any], options: Dict[str, Any]
+    ) -> str:
+        payload = json.dumps(
+            {"form": form_id, "template": template_version, "data": form_data, "options": options},
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def _expired(self, written: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and written <= now - self.ttl_seconds
+
+    def _remove(self, key: str):
+        size, _ = self._index.pop(key)
+        self._total -= size
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
+
+    def _load(self):
+        if self._loaded:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        now = time.time()
+        found = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self.suffix):
+                st = entry.stat()
+                if self._expired(st.st_mtime, now):
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+                    continue
+                key = entry.name[: -len(self.suffix)]
+                found.append((st.st_atime, key, st.st_size, st.st_mtime))
+        for _, key, size, written in sorted(found):
+            self._index[key] = (size, written)
+            self._total += size
+        self._loaded = True
+        logger.info(
+            f"Output cache ({self.suffix}): {len(self._index)} files, "
+            f"{self._total} bytes in {self.directory}"
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached file path for key (and mark it recently used), or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._load()
+            path = self._path(key)
+            now = time.time()
+            if key in self._index and os.path.exists(path):
+                _, written = self._index[key]
+                if not self._expired(written, now):
+                    self._index.move_to_end(key)
+                    self.hits += 1
+                    try:
+                        os.utime(path, (now, written))
+                    except OSError:
+                        pass
+                    return path
+            if key in self._index:
+                # Expired, or removed behind our back (another worker evicted it)
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, data: bytes):
+        if not self.enabled or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._load()
+            # Write-then-rename so readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+
+            if key in self._index:
+                self._total -= self._index.pop(key)[0]
+            self._index[key] = (len(data), time.time())
+            self._total += len(data)
+            self._evict()
+
+    def _evict(self):
+        while self._total > self.max_bytes and self._index:
+            self._remove(next(iter(self._index)))
+
+    def expire(self) -> int:
+        """Delete every entry older than ttl_seconds; returns how many were removed."""
+        if not self.enabled or self.ttl_seconds <= 0:
+            return 0
+        with self._lock:
+            self._load()
+            now = time.time()
+            expired = [
+                key for key, (_, written) in self._index.items() if self._expired(written, now)
+            ]
+            for key in expired:
+                self._remove(key)
+            return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "directory": self.directory,
+                "files": len(self._index),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+async def expire_periodically(caches: Iterable[OutputCache], interval: float = 300):
+    """Lifespan task: delete expired entries even while no request touches the caches."""
+    while True:
+        for cache in caches:
+            try:
+                removed = await asyncio.to_thread(cache.expire)
+            except Exception as e:
+                logger.warning(f"Output cache expiry failed in {cache.directory}: {e}")
+                continue
+            if removed:
+                logger.info(f"Expired {removed} cached files in {cache.directory}")
+        await asyncio.sleep(interval)
+
+
+output_cache = OutputCache(
+    directory=settings.OUTPUT_CACHE_DIR,
+    max_bytes=settings.OUTPUT_CACHE_MAX_MB * 1024 * 1024,
+    ttl_seconds=settings.OUTPUT_CACHE_TTL_MINUTES * 60,
+)
+
+# Rendered page previews, keyed by the fill's output-cache key plus page/dpi/format.
+# They show the same PII as the PDFs, so they expire on the same schedule
+preview_cache = OutputCache(
+    directory=settings.PREVIEW_CACHE_DIR,
+    max_bytes=settings.PREVIEW_CACHE_MAX_MB * 1024 * 1024,
+    suffix=".img",
+    ttl_seconds=settings.OUTPUT_CACHE_TTL_MINUTES * 60,
+)
@@ -0,0 +1,131 @@
+# backend/app/services/packet_service.py
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.form_configs.packet_config import PROFILE_FIELDS
+from app.core.metrics import StageTimer
+from app.services.form_registry import FORM_CONFIGS
+from app.services.pdf_workers import RenderResult
+
+logger = logging.getLogger(__name__)
+
+# (profile key, form key) for text fields;
+# (profile key, {lowercased value: form key}) for checkbox groups
+Projection = Tuple[Tuple[Tuple[str, str], ...], Tuple[Tuple[str, Dict[str, str]], ...]]
+
+
+def form_label(form_id: str) -> str:
+    # 'i130a' → 'I-130A'
+    if form_id.startswith("i") and form_id[1:2].isdigit():
+        return f"I-{form_id[1:].upper()}"
+    return form_id.upper()
+
+
+@lru_cache(maxsize=None)
+def projection_table(form_id: str) -> Projection:
+    """Profile → form key pairs for one form, checked against its FIELD_MAPPING once."""
+    mapping = FORM_CONFIGS[form_id]
+    text, groups = [], []
+    for profile_key, targets in PROFILE_FIELDS.items():
+        target = targets.get(form_id)
+        if target is None:
+            continue
+        if isinstance(target, dict):
+            known = {value.lower(): key for value, key in target.items() if key in mapping}
+            missing = [key for key in target.values() if key not in mapping]
+            if known:
+                groups.append((profile_key, known))
+        else:
+            missing = [] if target in mapping else [target]
+            if not missing:
+                text.append((profile_key, target))
+        if missing:
+            logger.warning(
+                f"Packet profile '{profile_key}' points at unknown "
+                f"{form_id.upper()} keys: {missing}"
+            )
+    return tuple(text), tuple(groups)
+
+
+def flatten_profile(profile: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """{'petitioner': {'address': {'city': 'X'}}} → {'petitioner.address.city': 'X'}"""
+    flat = {}
+    for key, value in profile.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_profile(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+
+def project_profile(
+    profile: Dict[str, Any],
+    forms: List[str],
+    overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Per-form fill payloads for one canonical profile. Overrides win over projected values."""
+    flat = flatten_profile(profile)
+    payloads = {}
+    for form_id in forms:
+        text, groups = projection_table(form_id)
+        data = {
+            form_key: flat[profile_key] for profile_key, form_key in text if profile_key in flat
+        }
+        for profile_key, choices in groups:
+            choice = choices.get(str(flat.get(profile_key) or "").strip().lower())
+            if choice:
+                data[choice] = "Yes"
+        data.update((overrides or {}).get(form_id, {}))
+        payloads[form_id] = data
+    return payloads
+
+
+def render_packet(
+    jobs: List[Tuple[str, Dict[str, Any]]],
+    options: Dict[str, Any],
+    save_profile: str,
+) -> RenderResult:
+    """Fill every form and merge them into one PDF with a bookmark per form.
+
+    Runs inside a worker process.
+    Each filled document is inserted straight from memory, so a form is only
+    serialized once, as part of the packet. `options` are fill_document keyword
+    arguments. `report` maps formId → {"timings", "report"} for that form.
+    """
+    import fitz
+    from app.services.field_converters import FormDataError
+    from app.services.pdf_filler import PDFFillerService, save_document
+
+    timer = StageTimer()
+    packet = fitz.open()
+    toc = []
+    forms: Dict[str, Dict[str, Any]] = {}
+    try:
+        for form_id, form_data in jobs:
+            service = PDFFillerService(form_id=form_id)
+            try:
+                doc = service.fill_document(form_data, **options)
+            except FormDataError as e:
+                raise FormDataError(e.errors, e.report, form_id=form_id)
+            timer.lap("fill")
+            try:
+                toc.append([1, form_label(form_id), packet.page_count + 1])
+                # Copies page objects and widgets directly (duplicate field names get renamed)
+                packet.insert_pdf(doc)
+            finally:
+                doc.close()
+            timer.lap("merge")
+            forms[form_id] = {
+                "timings": service.timer.as_dict(),
+                "report": service.report.as_dict(),
+            }
+        packet.set_toc(toc)
+
+        output = save_document(packet, save_profile)
+    finally:
+        packet.close()
+    timer.lap("save")
+    timer.count("forms", len(toc))
+    return RenderResult(output.getvalue(), timer.as_dict(), forms)
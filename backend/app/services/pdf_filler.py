@@ -3,37 +3,36 @@ import re
 import os
 import io
 import fitz
-from typing import Dict
+import threading
+from functools import partial
+from typing import Collection, Dict, List, NamedTuple, Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
-from app.core.form_configs import i130_config 
-from app.core.form_configs import i864_config
-from app.core.form_configs import i130a_config
-from app.core.form_configs import i129f_config
-from app.core.form_configs import i912_config
-from app.core.form_configs import i864a_config
-from app.core.form_configs import i864ez_config
-from app.core.form_configs import i693_config
-# from app.core.form_configs import ds260_config
-
-# Master mapping: formId → FIELD_MAPPING
-FORM_CONFIGS = {
-    "i130": i130_config.FIELD_MAPPING,
-    "i864": i864_config.FIELD_MAPPING,
-    "i130a": i130a_config.FIELD_MAPPING,
-    "i129f": i129f_config.FIELD_MAPPING,
-    "i912": i912_config.FIELD_MAPPING,
-    "i864a": i864a_config.FIELD_MAPPING,
-    "i864ez": i864ez_config.FIELD_MAPPING,
-    "i693": i693_config.FIELD_MAPPING,
-    # "ds260": ds260_config.FIELD_MAPPING,
-    # "i485": i485_config.FIELD_MAPPING,
-    # "i765": i765_config.FIELD_MAPPING,
-}
+from app.core.config import settings
+from app.core.metrics import StageTimer
+from app.services.template_cache import template_cache
+from app.services.form_artifacts import load_widget_index
+from app.services.template_preprocess import resolve_template
+from app.services.field_converters import (
+    BUTTON_TYPES,
+    CHECKED_VALUES,
+    FieldConverter,
+    FillReport,
+    FormDataError,
+    build_converters,
+    validate_form_data,
+)
+from app.services.form_registry import FORM_CONFIGS  # formId → FIELD_MAPPING, imported on first use
+
+PDFS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "pdfs"))
 
-# Auto-find PDF templates
+# Auto-find PDF templates (resolved once per source version, see template_cache.resolve)
 def find_pdf_template(form_id: str) -> str:
+    return template_cache.resolve(form_id, _probe_pdf_template, resolve_template)
+
+
+def _probe_pdf_template(form_id: str) -> str:
     # form_id is already normalized (e.g., 'i130a')
     # Try with hyphen if it looks like a USCIS form
     hyphenated = form_id
@@ -58,61 +57,395 @@ def find_pdf_template(form_id: str) -> str:
         if os.path.exists(abs_path):
             logger.info(f"Found PDF: {abs_path}")
             return abs_path
+
+    # Case-insensitive match in the bundled pdfs dir (e.g. I-864a.pdf on Linux)
+    if os.path.isdir(PDFS_DIR):
+        wanted = {f"{form_id}.pdf", f"{hyphenated}.pdf"}
+        for name in os.listdir(PDFS_DIR):
+            if name.lower() in wanted:
+                abs_path = os.path.join(PDFS_DIR, name)
+                logger.info(f"Found PDF: {abs_path}")
+                return abs_path
     
     raise FileNotFoundError(f"PDF not found for form: {form_id}")
 
+
+# doc.save() options per profile
+SAVE_PROFILES = {
+    # Rewrite, deduplicate and recompress everything: smallest file, slowest
+    "full": dict(garbage=4, deflate=True, clean=True),
+    # Write the object table as-is, no garbage collection or stream cleanup
+    "fast": dict(garbage=0, deflate=False, clean=False),
+}
+
+# "fast" for flattened output: with the form and tag tree gone most objects are
+# unreferenced, and dropping them is cheaper than writing them out
+FLATTENED_FAST_SAVE = dict(garbage=2, deflate=False, clean=False)
+
+
+def save_document(doc: fitz.Document, profile: str = "full", flattened: bool = False) -> io.BytesIO:
+    output = io.BytesIO()
+    if flattened and profile != "full":
+        doc.save(output, **FLATTENED_FAST_SAVE)
+    else:
+        doc.save(output, **SAVE_PROFILES[profile])
+    output.seek(0)
+    return output
+
+
+# How filled values get their appearance streams:
+#   update   - widget.update() per widget as it is filled (default, most compatible)
+#   deferred - values written straight into the field dictionaries, NeedAppearances
+#              set so the viewer draws them; checkboxes just switch /AS
+#   batched  - like deferred, then one pass per page regenerating text/choice widgets
+APPEARANCE_MODES = ("update", "deferred", "batched")
+
+# CHECKED_VALUES and BUTTON_TYPES come from field_converters (still importable from here)
+
+
+class WidgetRef(NamedTuple):
+    page: int
+    xref: int
+    field_type: int
+    field_name: str
+    field_xref: int  # dictionary holding /V (the widget itself unless it is a bare kid)
+    on_state: str  # checkbox/radio export name as PDF name text, e.g. 'Y' or '#20APT#20'
+    max_len: int = 0  # text /MaxLen, 0 = unlimited
+    comb: bool = False  # text comb field (one character per box)
+    choices: Tuple[str, ...] = ()  # combo/list box options
+
+
+# PDF 1.7 table 228, text field flag bit 25
+COMB_FLAG = 1 << 24
+
+
+def _suffix(field_name: str) -> str:
+    return field_name.split(".")[-1]
+
+
+class WidgetIndex:
+    """Per-template lookup of widgets by full field name and by last-segment suffix.
+
+    Built once the first time a template is used, so resolving a frontend key
+    is a dict lookup instead of a walk over every widget on every page.
+    """
+
+    def __init__(self, doc: fitz.Document):
+        refs = []
+        for page_num, page in enumerate(doc):
+            for widget in page.widgets():
+                field_xref = widget.xref
+                if doc.xref_get_key(widget.xref, "T")[0] == "null":
+                    parent = doc.xref_get_key(widget.xref, "Parent")
+                    if parent[0] == "xref":
+                        field_xref = int(parent[1].split()[0])
+                on_state = ""
+                if widget.field_type in BUTTON_TYPES:
+                    on_state = widget.on_state() or "Yes"
+                choices = ()
+                if widget.field_type in (
+                    fitz.PDF_WIDGET_TYPE_COMBOBOX,
+                    fitz.PDF_WIDGET_TYPE_LISTBOX,
+                ):
+                    # Options may be [export, display] pairs; the export value is what /V holds
+                    choices = tuple(
+                        c[0] if isinstance(c, (list, tuple)) else c
+                        for c in widget.choice_values or ()
+                    )
+                refs.append(
+                    WidgetRef(
+                        page_num,
+                        widget.xref,
+                        widget.field_type,
+                        widget.field_name,
+                        field_xref,
+                        str(on_state),
+                        widget.text_maxlen or 0,
+                        bool(widget.field_flags & COMB_FLAG),
+                        choices,
+                    )
+                )
+        self._build(refs)
+
+    @classmethod
+    def from_refs(cls, refs: List[WidgetRef]) -> "WidgetIndex":
+        """Rebuild an index from already-extracted widgets (see form_artifacts)."""
+        index = cls.__new__(cls)
+        index._build(refs)
+        return index
+
+    def _build(self, refs: List[WidgetRef]):
+        self.refs = refs
+        self.by_name: Dict[str, List[WidgetRef]] = {}
+        for ref in refs:
+            self.by_name.setdefault(ref.field_name, []).append(ref)
+        self.widget_count = len(refs)
+
+        # suffix → distinct full names carrying it (more than one = ambiguous)
+        self.by_suffix: Dict[str, List[str]] = {}
+        for name in self.by_name:
+            self.by_suffix.setdefault(_suffix(name), []).append(name)
+
+        self._bound: Dict[str, Tuple[Dict[str, Tuple[WidgetRef, ...]], Dict[str, List[str]]]] = {}
+        self._converters: Dict[str, Dict[str, FieldConverter]] = {}
+        self._lock = threading.Lock()
+
+    def converters(self, form_id: str, field_mapping: Dict[str, str]) -> Dict[str, FieldConverter]:
+        """frontend key → value converter for every resolved key, built once per form."""
+        converters = self._converters.get(form_id)
+        if converters is None:
+            resolved, _ = self.bind(form_id, field_mapping)
+            converters = self._converters[form_id] = build_converters(resolved)
+        return converters
+
+    def preload(
+        self,
+        form_id: str,
+        resolved: Dict[str, Tuple[WidgetRef, ...]],
+        ambiguous: Dict[str, List[str]],
+    ):
+        """Install a binding computed ahead of time so bind() returns it directly."""
+        self._bound[form_id] = (resolved, ambiguous)
+
+    def resolve(
+        self, pdf_field_name: str, claimed: Collection[str] = ()
+    ) -> Tuple[Tuple[WidgetRef, ...], List[str]]:
+        """Return (widgets, ambiguous_names). An exact name always wins over a suffix match.
+
+        An exact match also takes the widgets sharing its suffix (a name repeated on a
+        later page, e.g. I-693 P13), except those `claimed` by their own mapping entry.
+        """
+        names = self.by_suffix.get(_suffix(pdf_field_name), [])
+        if pdf_field_name in self.by_name:
+            twins = [n for n in names if n != pdf_field_name and n not in claimed]
+            return tuple(ref for n in [pdf_field_name, *twins] for ref in self.by_name[n]), []
+        if len(names) == 1:
+            return tuple(self.by_name[names[0]]), []
+        return (), names
+
+    def bind(self, form_id: str, field_mapping: Dict[str, str]):
+        """Resolve every key of a form's FIELD_MAPPING once and cache the result.
+
+        Returns (resolved, ambiguous) where resolved maps frontend key → widgets and
+        ambiguous maps frontend key → the colliding PDF field names.
+        """
+        bound = self._bound.get(form_id)
+        if bound is not None:
+            return bound
+
+        with self._lock:
+            if form_id in self._bound:
+                return self._bound[form_id]
+
+            resolved: Dict[str, Tuple[WidgetRef, ...]] = {}
+            ambiguous: Dict[str, List[str]] = {}
+            claimed = set(field_mapping.values())
+            for frontend_key, pdf_field_name in field_mapping.items():
+                refs, collisions = self.resolve(pdf_field_name, claimed)
+                if refs:
+                    resolved[frontend_key] = refs
+                elif collisions:
+                    ambiguous[frontend_key] = collisions
+
+            if ambiguous:
+                logger.warning(
+                    f"{form_id.upper()}: {len(ambiguous)} mapped keys have ambiguous suffix "
+                    f"matches and will not be filled: {dict(list(ambiguous.items())[:10])}"
+                )
+            logger.info(
+                f"Indexed {self.widget_count} widgets for {form_id.upper()} "
+                f"({len(resolved)}/{len(field_mapping)} keys resolved)"
+            )
+            self._bound[form_id] = (resolved, ambiguous)
+            return self._bound[form_id]
+
+
+def normalize_form_id(form_id: str) -> str:
+    # Match frontend logic: 'I-130A' → 'i130a'
+    return re.sub(r"[^a-z0-9]", "", form_id.lower())
+
+
 class PDFFillerService:
     def __init__(self, form_id: str):
-        # Normalize form_id (match frontend logic)
-        self.form_id = re.sub(r'[^a-z0-9]', '', form_id.lower())
+        self.form_id = normalize_form_id(form_id)
         
         if self.form_id not in FORM_CONFIGS:
             raise ValueError(f"Form '{form_id}' (normalized: '{self.form_id}') not supported. Available: {list(FORM_CONFIGS.keys())}")
         
         self.field_mapping = FORM_CONFIGS[self.form_id]
-        self.pdf_path = find_pdf_template(self.form_id)
+        self.timer = StageTimer()
+        self.report: FillReport = None  # set by validate()/fill_pdf()
+        with self.timer.stage("lookup"):
+            self.pdf_path = find_pdf_template(self.form_id)
+
+    def widget_index(self, template) -> WidgetIndex:
+        """Template's WidgetIndex, from the compiled artifact when one matches, else by scanning."""
+        return template.derive(
+            "widget_index",
+            WidgetIndex,
+            loader=partial(load_widget_index, self.form_id, self.field_mapping),
+        )
+
+    def _prepare(self, form_data: Dict[str, any]):
+        """(template, resolved bindings, final values); sets self.report. No PDF is opened."""
+        timer = self.timer
+        with timer.stage("template"):
+            template = template_cache.get(self.pdf_path)
+        with timer.stage("index"):
+            index = self.widget_index(template)
+            resolved, ambiguous = index.bind(self.form_id, self.field_mapping)
+            converters = index.converters(self.form_id, self.field_mapping)
+        # Every value in its final form before the document is opened
+        with timer.stage("validate"):
+            values, self.report = validate_form_data(
+                form_data, self.field_mapping, converters, ambiguous
+            )
+        return template, resolved, values
+
+    def validate(self, form_data: Dict[str, any]) -> FillReport:
+        """What fill_pdf would do with form_data, without opening or writing the PDF."""
+        self._prepare(form_data)
+        return self.report
 
-    def fill_pdf(self, form_data: Dict[str, any]) -> io.BytesIO:
-        doc = fitz.open(self.pdf_path)
+    def fill_pdf(
+        self,
+        form_data: Dict[str, any],
+        save_profile: str = None,
+        appearance_mode: str = None,
+        flatten: bool = False,
+    ) -> io.BytesIO:
+        """Fill the template with form_data and save it.
+
+        flatten=True burns field appearances into the page content and drops the
+        form (non-editable output, smaller and faster to render).
+        """
+        save_profile = save_profile or settings.PDF_SAVE_PROFILE
+        if save_profile not in SAVE_PROFILES:
+            raise ValueError(
+                f"Unknown save profile '{save_profile}'. Available: {list(SAVE_PROFILES.keys())}"
+            )
+        doc = self.fill_document(form_data, appearance_mode, flatten)
+
+        with self.timer.stage("save"):
+            output = save_document(doc, save_profile, flattened=flatten)
+            doc.close()
+        return output
+
+    def fill_document(
+        self,
+        form_data: Dict[str, any],
+        appearance_mode: str = None,
+        flatten: bool = False,
+    ) -> fitz.Document:
+        """fill_pdf without the save: the filled document, still open. The caller closes it."""
+        appearance_mode = appearance_mode or settings.PDF_APPEARANCE_MODE
+        if appearance_mode not in APPEARANCE_MODES:
+            raise ValueError(
+                f"Unknown appearance mode '{appearance_mode}'. Available: {list(APPEARANCE_MODES)}"
+            )
+
+        if flatten and appearance_mode == "deferred":
+            # Deferred leaves appearances to the viewer; there would be nothing to burn in
+            appearance_mode = "batched"
+
+        timer = self.timer
+        template, resolved, values = self._prepare(form_data)
+        report = self.report
+        if not report.ok:
+            raise FormDataError(report.invalid, report.as_dict())
+
+        with timer.stage("open"):
+            doc = template.open()
+
+        # Group work by page so each page is loaded once
+        with timer.stage("match"):
+            by_page: Dict[int, List[Tuple[WidgetRef, Union[str, bool]]]] = {}
+            for frontend_key, value in values.items():
+                for ref in resolved[frontend_key]:
+                    by_page.setdefault(ref.page, []).append((ref, value))
+
+        with timer.stage("widgets"):
+            if appearance_mode == "update":
+                filled_count = self._fill_widgets(doc, by_page)
+            else:
+                filled_count = self._write_values(
+                    doc, by_page, regenerate=appearance_mode == "batched"
+                )
+        timer.count("filled", filled_count)
+        timer.count(
+            "unfilled", len(report.unmapped) + len(report.unresolved) + len(report.ambiguous)
+        )
+
+        logger.info(f"Filled {filled_count} fields for {self.form_id.upper()} ({report.header()})")
+        if report.unmapped or report.unresolved:
+            logger.warning(f"Unfilled keys: {(report.unmapped + report.unresolved)[:20]}")
+        if report.ambiguous:
+            logger.warning(f"Skipped ambiguous keys: {report.ambiguous[:20]}")
+        if report.warnings:
+            logger.warning(f"Values written with warnings: {list(report.warnings.items())[:10]}")
+
+        if flatten:
+            with timer.stage("flatten"):
+                # Widgets only: links and other annotations stay interactive
+                doc.bake(annots=False, widgets=True)
+                # The tag tree points at the widgets just removed and doesn't cover the
+                # burned-in text; keeping it would also keep every field object alive
+                catalog = doc.pdf_catalog()
+                doc.xref_set_key(catalog, "StructTreeRoot", "null")
+                doc.xref_set_key(catalog, "MarkInfo", "null")
+        return doc
+
+    def _fill_widgets(self, doc: fitz.Document, by_page) -> int:
         filled_count = 0
-        unfilled = []
-
-        for frontend_key, value in form_data.items():
-            pdf_field_name = self.field_mapping.get(frontend_key)
-            if not pdf_field_name:
-                unfilled.append(frontend_key)
-                continue
-
-            str_value = str(value or "").strip()
-            if not str_value:
-                continue
-
-            field_found = False
-            for page in doc:
-                for widget in page.widgets():
-                    if widget.field_name == pdf_field_name or \
-                       widget.field_name.split('.')[-1] == pdf_field_name.split('.')[-1]:
-                        try:
-                            if widget.field_type in (fitz.PDF_WIDGET_TYPE_CHECKBOX, fitz.PDF_WIDGET_TYPE_RADIOBUTTON):
-                                is_checked = str(value).lower() in ["yes", "true", "1", "on"]
-                                widget.field_value = "Yes" if is_checked else "Off"
-                            else:
-                                widget.field_value = str_value
-                            widget.update()
-                            filled_count += 1
-                            field_found = True
-                        except Exception as e:
-                            logger.error(f"Error filling {pdf_field_name}: {e}")
-            
-            if not field_found:
-                unfilled.append(frontend_key)
-
-        logger.info(f"Filled {filled_count} fields for {self.form_id.upper()}")
-        if unfilled:
-            logger.warning(f"Unfilled keys: {unfilled[:20]}")
-
-        output = io.BytesIO()
-        doc.save(output, garbage=4, deflate=True, clean=True)
-        doc.close()
-        output.seek(0)
-        return output
\ No newline at end of file
+        for page_num, items in by_page.items():
+            page = doc[page_num]
+            for ref, value in items:
+                try:
+                    widget = page.load_widget(ref.xref)
+                    self.timer.count("widgets_visited")
+                    if ref.field_type in BUTTON_TYPES:
+                        widget.field_value = "Yes" if value else "Off"
+                    else:
+                        widget.field_value = value
+                    widget.update()
+                    filled_count += 1
+                except Exception as e:
+                    logger.error(f"Error filling {ref.field_name}: {e}")
+        return filled_count
+
+    def _write_values(self, doc: fitz.Document, by_page, regenerate: bool) -> int:
+        """Set /V (and /AS for buttons) directly in the field dictionaries."""
+        filled_count = 0
+        stale = {}  # page → text/choice widgets whose appearance no longer matches /V
+        for page_num, items in by_page.items():
+            for ref, value in items:
+                self.timer.count("widgets_visited")
+                try:
+                    if ref.field_type in BUTTON_TYPES:
+                        state = ref.on_state if value else "Off"
+                        doc.xref_set_key(ref.field_xref, "V", f"/{state}")
+                        doc.xref_set_key(ref.xref, "AS", f"/{state}")
+                    else:
+                        doc.xref_set_key(ref.field_xref, "V", fitz.get_pdf_str(value))
+                        stale.setdefault(page_num, []).append(ref)
+                    filled_count += 1
+                except Exception as e:
+                    logger.error(f"Error filling {ref.field_name}: {e}")
+
+        if regenerate:
+            # One pass per page; buttons already show the right state via /AS
+            for page_num, refs in stale.items():
+                page = doc[page_num]
+                for ref in refs:
+                    self.timer.count("widgets_visited")
+                    try:
+                        page.load_widget(ref.xref).update()
+                    except Exception as e:
+                        logger.error(f"Error drawing {ref.field_name}: {e}")
+        elif stale:
+            acroform = doc.xref_get_key(doc.pdf_catalog(), "AcroForm")
+            if acroform[0] == "xref":
+                doc.xref_set_key(int(acroform[1].split()[0]), "NeedAppearances", "true")
+            else:
+                doc.xref_set_key(doc.pdf_catalog(), "AcroForm/NeedAppearances", "true")
+        return filled_count
@@ -0,0 +1,188 @@
+# backend/app/services/pdf_workers.py
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.form_registry import get_generator, parse_form_list, warmup
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturated(Exception):
+    """Raised when the PDF worker queue is full and the request should be shed."""
+
+
+class RenderResult(NamedTuple):
+    pdf: bytes
+    timings: Dict[str, Dict]  # StageTimer.as_dict() from the worker
+    # FillReport.as_dict() for AcroForm fills; render_packet: formId → {"timings", "report"}
+    report: Optional[Dict[str, Any]] = None
+
+
+def render_form(
+    form_id: str, form_data: Dict[str, Any], options: Optional[Dict[str, Any]] = None
+) -> RenderResult:
+    """Generate one filled/rendered PDF. Runs inside a worker process.
+
+    `options` are PDFFillerService.fill_pdf keyword arguments (save_profile,
+    appearance_mode, ...); the ReportLab generators ignore them.
+    """
+    # Imported here so processes that load this module without filling forms (the
+    # image pool's workers) never import PyMuPDF and the form services. The API
+    # process has them anyway: pdf_routes imports pdf_filler at startup
+    from app.services.pdf_filler import PDFFillerService
+
+    generator = get_generator(form_id)
+    if generator is not None:
+        service = generator()
+        if form_id.lower() == "police_verification":
+            output = service.generate_pdf(
+                form_data=form_data, province=form_data.get("province", "")
+            )
+        else:
+            output = service.generate_pdf(form_data=form_data)
+    else:
+        service = PDFFillerService(form_id=form_id)
+        output = service.fill_pdf(form_data=form_data, **(options or {}))
+        return RenderResult(output.getvalue(), service.timer.as_dict(), service.report.as_dict())
+    return RenderResult(output.getvalue(), service.timer.as_dict())
+
+
+def _noop():
+    return None
+
+
+class PDFWorkerPool:
+    """Shared process pool for CPU-bound PDF generation.
+
+    At most `workers + max_queue` jobs are admitted at once; anything beyond
+    that is rejected immediately with PoolSaturated instead of piling up.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: Tuple = (),
+        name: str = "PDF worker pool",
+    ):
+        self.name = name
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def start(self):
+        if self._executor is None:
+            # spawn: the parent runs an event loop and threads, which don't survive fork well
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer,
+                initargs=self.initargs,
+            )
+            logger.info(
+                f"{self.name} started ({self.workers} workers, queue depth {self.max_queue})"
+            )
+
+    def prestart(self):
+        """Spawn every worker now (the executor otherwise starts them on first use)."""
+        self.start()
+        for _ in range(self.workers):
+            self._executor.submit(_noop)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            logger.info(f"{self.name} stopped")
+
+    def admit(self):
+        if self._in_flight >= self.capacity:
+            raise PoolSaturated(f"{self.name} queue full ({self._in_flight}/{self.capacity})")
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        self.admit()
+        self.start()
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        except BrokenProcessPool:
+            # A worker died (usually OOM); replace the pool so later requests recover
+            logger.error(f"{self.name} broken, restarting")
+            broken, self._executor = self._executor, None
+            if broken is not None:
+                broken.shutdown(wait=False, cancel_futures=True)
+            self.start()
+            raise
+        finally:
+            self._in_flight -= 1
+
+    async def map_unordered(
+        self,
+        fn: Callable[..., Any],
+        arg_tuples: Iterable[Tuple],
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """Yield (index, result or exception) for each job as soon as it finishes.
+
+        Call admit() before streaming starts to reject a batch up front. Each item
+        then waits for room under `capacity` like any other task, and at most
+        `concurrency` items (default: one per worker) run at a time so a batch
+        can't crowd single requests out of the queue.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        sem = asyncio.Semaphore(concurrency or self.workers)
+
+        async def one(i: int, args: Tuple):
+            async with sem:
+                while self._in_flight >= self.capacity:
+                    # Single requests get 503s while the queue is full; batch items wait
+                    await asyncio.sleep(0.1)
+                self._in_flight += 1
+                try:
+                    return i, await loop.run_in_executor(self._executor, fn, *args)
+                except Exception as e:
+                    return i, e
+                finally:
+                    self._in_flight -= 1
+
+        tasks = [asyncio.ensure_future(one(i, args)) for i, args in enumerate(arg_tuples)]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+        finally:
+            # Client went away or we're done: don't leave queued items behind
+            for task in tasks:
+                task.cancel()
+
+
+_warmup_forms = tuple(parse_form_list(settings.WARMUP_FORMS))
+
+pdf_pool = PDFWorkerPool(
+    workers=settings.PDF_POOL_WORKERS,
+    max_queue=settings.PDF_POOL_QUEUE_DEPTH,
+    initializer=warmup if _warmup_forms else None,  # runs once in each spawned worker
+    initargs=(_warmup_forms,),
+)
+
+metrics.gauge("pdf_pool.in_flight", lambda: pdf_pool.in_flight)
+metrics.gauge("pdf_pool.capacity", lambda: pdf_pool.capacity)
@@ -6,10 +6,14 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
 
+from app.core.metrics import StageTimer
+
 class PoliceLetterGeneratorService:
     def __init__(self):
+        self.timer = StageTimer()
         self.styles = getSampleStyleSheet()
         self.setup_custom_styles()
+        self.timer.lap("setup")
 
     def setup_custom_styles(self):
         # Base style for the whole document (Times-Roman)
@@ -78,6 +82,7 @@ class PoliceLetterGeneratorService:
         )
 
     def generate_pdf(self, form_data: dict, province: str) -> io.BytesIO:
+        self.timer.mark()
         buffer = io.BytesIO()
         # Create a SimpleDocTemplate with A4 size and margins
         doc = SimpleDocTemplate(
@@ -151,7 +156,9 @@ class PoliceLetterGeneratorService:
         flowables.append(Paragraph(f"Date: {date_str}", self.base_style))
         
         # Build the PDF
+        self.timer.lap("layout")
         doc.build(flowables)
+        self.timer.lap("build")
         
         buffer.seek(0)
         return buffer
@@ -0,0 +1,58 @@
+# backend/app/services/preview_service.py
+import hashlib
+from typing import Dict, List, NamedTuple
+
+from app.core.config import settings
+from app.core.metrics import StageTimer
+
+PREVIEW_FORMATS = {"png": "image/png", "webp": "image/webp"}
+
+
+class PreviewResult(NamedTuple):
+    page_count: int
+    images: Dict[int, bytes]  # 1-based page number → encoded image
+    timings: Dict[str, Dict]
+
+
+def preview_key(fill_key: str, page: int, dpi: int, fmt: str) -> str:
+    return hashlib.sha256(f"{fill_key}:{page}:{dpi}:{fmt}".encode()).hexdigest()
+
+
+def page_count_key(fill_key: str) -> str:
+    return preview_key(fill_key, 0, 0, "page_count")
+
+
+def split_pages(pages: List[int], parts: int) -> List[List[int]]:
+    """Round-robin pages over at most `parts` jobs, so each worker opens the PDF once."""
+    parts = max(1, min(parts, len(pages)))
+    return [pages[i::parts] for i in range(parts)]
+
+
+def render_previews(pdf: bytes, pages: List[int], dpi: int, fmt: str) -> PreviewResult:
+    """Rasterize the given pages of a filled PDF. Runs inside a worker process.
+
+    Pages outside the document are skipped; the caller checks them against page_count.
+    """
+    import fitz
+
+    timer = StageTimer()
+    doc = fitz.open(stream=pdf, filetype="pdf")
+    timer.lap("open")
+    images = {}
+    try:
+        for page in pages:
+            if not 1 <= page <= doc.page_count:
+                continue
+            # Widgets are annotations; their appearance streams carry the filled values
+            pix = doc[page - 1].get_pixmap(dpi=dpi, alpha=False, annots=True)
+            timer.lap("render")
+            if fmt == "webp":
+                images[page] = pix.pil_tobytes(format="WEBP", quality=settings.PREVIEW_WEBP_QUALITY)
+            else:
+                images[page] = pix.tobytes("png")
+            timer.lap("encode")
+        page_count = doc.page_count
+    finally:
+        doc.close()
+    timer.count("pages", len(images))
+    return PreviewResult(page_count, images, timer.as_dict())
@@ -0,0 +1,171 @@
+# backend/app/services/template_cache.py
+import os
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import fitz
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _version(mtime_ns: int, size: int) -> str:
+    return f"{mtime_ns:x}-{size:x}"
+
+
+class TemplateEntry:
+    """One cached template: raw bytes plus anything derived from them (widget index, etc.)"""
+
+    def __init__(self, path: str, mtime_ns: int, size: int, data: bytes):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.data = data
+        self._derived: Dict[str, Any] = {}
+        self._sha256: Optional[bytes] = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> str:
+        return _version(self.mtime_ns, self.size)
+
+    @property
+    def sha256(self) -> bytes:
+        """Content digest, for artifacts that must match the exact template bytes."""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.data).digest()
+        return self._sha256
+
+    def open(self) -> fitz.Document:
+        # Per-request copy: MuPDF parses the in-memory xref lazily, no disk access
+        return fitz.open(stream=self.data, filetype="pdf")
+
+    def derive(
+        self,
+        key: str,
+        factory: Callable[[fitz.Document], Any],
+        loader: Optional[Callable[["TemplateEntry"], Any]] = None,
+    ) -> Any:
+        """Compute (once per template version) something that needs a parsed document.
+
+        `loader`, if given, is tried first (e.g. a precompiled artifact); the
+        document is only opened when it returns None.
+        """
+        value = self._derived.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            if key not in self._derived and loader is not None:
+                value = loader(self)
+                if value is not None:
+                    self._derived[key] = value
+            if key not in self._derived:
+                doc = self.open()
+                try:
+                    self._derived[key] = factory(doc)
+                finally:
+                    doc.close()
+            return self._derived[key]
+
+
+class TemplateCache:
+    """Bounded LRU of PDF templates, revalidated against the file's mtime on every lookup."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, TemplateEntry]" = OrderedDict()
+        # form_id → (source template, its version, path to load)
+        self._paths: Dict[str, Tuple[str, str, str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def resolve(
+        self,
+        form_id: str,
+        finder: Callable[[str], str],
+        transform: Optional[Callable[[str], str]] = None,
+    ) -> str:
+        """Memoize template path lookup, keyed on the source file's (mtime, size).
+
+        `finder` locates the source template and `transform` (e.g. preprocessing) maps
+        it to the path actually loaded. Both re-run when the source changes on disk or
+        either file disappears, so a replaced template is never served from a stale copy.
+        """
+        memo = self._paths.get(form_id)
+        if memo is not None:
+            source, version, path = memo
+            try:
+                if self.version(source) == version and os.path.exists(path):
+                    return path
+            except FileNotFoundError:
+                pass
+            logger.info(f"Template source changed, re-resolving {form_id}: {source}")
+        source = finder(form_id)
+        # stat before transform reads the file: a write in between only forces another resolve
+        version = self.version(source)
+        path = transform(source) if transform is not None else source
+        self._paths[form_id] = (source, version, path)
+        return path
+
+    @staticmethod
+    def version(path: str) -> str:
+        """Template version from a stat() alone, without loading the file."""
+        st = os.stat(path)
+        return _version(st.st_mtime_ns, st.st_size)
+
+    def get(self, path: str) -> TemplateEntry:
+        st = os.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+
+        # Miss (or stale): read outside the lock so other templates stay available
+        with open(path, "rb") as f:
+            data = f.read()
+        entry = TemplateEntry(path, st.st_mtime_ns, st.st_size, data)
+
+        with self._lock:
+            self.misses += 1
+            if path in self._entries:
+                logger.info(f"Template changed on disk, reloading: {path}")
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self.evictions += 1
+                logger.info(f"Evicted template from cache: {evicted}")
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": sum(e.size for e in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "templates": list(self._entries.keys()),
+            }
+
+    def clear(self, path: Optional[str] = None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._paths.clear()
+            else:
+                self._entries.pop(path, None)
+
+
+template_cache = TemplateCache(max_entries=settings.TEMPLATE_CACHE_SIZE)
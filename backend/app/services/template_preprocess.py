@@ -0,0 +1,151 @@
+# backend/app/services/template_preprocess.py
+"""One-time preprocessing of the bundled PDF templates.
+
+The USCIS templates are hybrid XFA/AcroForm documents. We only ever fill the
+AcroForm side, but every open, fill and save still carries the XFA packets,
+Adobe's usage-rights signature and duplicated resources. Preprocessing:
+
+- removes /XFA (viewers then render the AcroForm fields we actually fill)
+- removes /Perms and /SigFlags (the usage-rights signature is invalidated by any edit anyway)
+- removes Adobe's "!ADBE::" XFA version-check document scripts
+- rewrites the file with duplicate objects merged, streams compressed and
+  objects packed into object streams
+
+Field names are left exactly as they are: FIELD_MAPPING and the compiled form
+artifacts address widgets by their full names. The result is checked to hold
+the same widgets before it is used.
+
+Outputs are stored as `<template>.v<PREPROCESS_VERSION>.<source sha256[:12]>.pdf`,
+so an updated template or a change to the steps above never picks up a stale
+copy. Saving is deterministic (no new /ID), so artifacts can be committed and
+the compiled form artifacts built against them stay valid.
+"""
+
+import os
+import re
+import glob
+import hashlib
+import logging
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+import fitz
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when the steps below change so existing artifacts are rebuilt
+PREPROCESS_VERSION = 1
+
+SAVE_OPTIONS = dict(garbage=4, deflate=True, use_objstms=1, no_new_id=True)
+
+_ADOBE_SCRIPT = re.compile(r"\((!ADBE::[^)]*)\)")
+_NAME_STRING = re.compile(r"\(((?:[^()\\]|\\.)*)\)")
+
+
+def preprocessed_path(source_path: str, source_sha256: str) -> str:
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(
+        settings.TEMPLATE_ARTIFACTS_DIR, f"{stem}.v{PREPROCESS_VERSION}.{source_sha256[:12]}.pdf"
+    )
+
+
+def _remove_stale(source_path: str, keep: str):
+    """Delete older preprocessed copies of source_path (other source digests or versions)."""
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    for path in glob.glob(
+        os.path.join(glob.escape(settings.TEMPLATE_ARTIFACTS_DIR), f"{glob.escape(stem)}.v*.pdf")
+    ):
+        if os.path.abspath(path) == os.path.abspath(keep):
+            continue
+        try:
+            os.unlink(path)
+            logger.info(f"Removed stale preprocessed template {os.path.basename(path)}")
+        except OSError as e:
+            logger.warning(f"Could not remove stale preprocessed template {path}: {e}")
+
+
+def _ref_xref(doc: fitz.Document, xref: int, key: str) -> Optional[int]:
+    kind, value = doc.xref_get_key(xref, key)
+    return int(value.split()[0]) if kind == "xref" else None
+
+
+def _widget_names(doc: fitz.Document) -> List[Tuple[int, str]]:
+    return [(page.number, w.field_name) for page in doc for w in page.widgets()]
+
+
+def preprocess_template(data: bytes) -> Tuple[bytes, Dict[str, Any]]:
+    """Return (preprocessed PDF bytes, what was removed). Raises ValueError if widgets changed."""
+    doc = fitz.open(stream=data, filetype="pdf")
+    try:
+        before = _widget_names(doc)
+        catalog = doc.pdf_catalog()
+        removed: Dict[str, Any] = {}
+
+        acroform = _ref_xref(doc, catalog, "AcroForm")
+        if acroform is not None:
+            for key in ("XFA", "SigFlags"):
+                if doc.xref_get_key(acroform, key)[0] != "null":
+                    doc.xref_set_key(acroform, key, "null")
+                    removed[key] = True
+        if doc.xref_get_key(catalog, "Perms")[0] != "null":
+            doc.xref_set_key(catalog, "Perms", "null")
+            removed["Perms"] = True
+
+        names = _ref_xref(doc, catalog, "Names")
+        scripts = _ref_xref(doc, names, "JavaScript") if names is not None else None
+        if scripts is not None:
+            tree = doc.xref_object(scripts)
+            all_names = _NAME_STRING.findall(tree)
+            adobe = _ADOBE_SCRIPT.findall(tree)
+            # Only Adobe's XFA version checks; a form with its own scripts keeps them all
+            if all_names and len(adobe) == len(all_names):
+                doc.xref_set_key(names, "JavaScript", "null")
+                removed["JavaScript"] = adobe
+
+        output = doc.tobytes(**SAVE_OPTIONS)
+    finally:
+        doc.close()
+
+    check = fitz.open(stream=output, filetype="pdf")
+    try:
+        if _widget_names(check) != before:
+            raise ValueError("preprocessing changed the template's widgets")
+    finally:
+        check.close()
+    return output, removed
+
+
+def build_preprocessed(source_path: str) -> str:
+    """Write the preprocessed copy of source_path (if missing) and return its path."""
+    with open(source_path, "rb") as f:
+        data = f.read()
+    path = preprocessed_path(source_path, hashlib.sha256(data).hexdigest())
+    if os.path.exists(path):
+        return path
+
+    output, removed = preprocess_template(data)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write-then-rename: several workers may build the same template at once
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(output)
+    os.replace(tmp_path, path)
+    _remove_stale(source_path, path)
+    logger.info(
+        f"Preprocessed template {os.path.basename(source_path)}: "
+        f"{len(data)} → {len(output)} bytes, removed {sorted(removed)}"
+    )
+    return path
+
+
+def resolve_template(source_path: str) -> str:
+    """Path to load for source_path: its preprocessed copy, or the source if disabled or failing."""
+    if not settings.TEMPLATE_PREPROCESS:
+        return source_path
+    try:
+        return build_preprocessed(source_path)
+    except Exception as e:
+        logger.warning(f"Using unprocessed template {source_path}: {e}")
+        return source_path
@@ -0,0 +1,4 @@
+"""Performance benchmarks for PDF generation.
+
+Run from backend/, e.g. python -m benchmarks.save_profiles
+"""
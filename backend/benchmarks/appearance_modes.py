@@ -0,0 +1,120 @@
+# backend/benchmarks/appearance_modes.py
+"""Speed and correctness of each appearance mode for every form in FORM_CONFIGS.
+
+Correctness is checked by reopening the output: every filled field must read
+back with the expected value, and pages are rendered and compared pixel-wise
+against the `update` mode output (what users get today).
+
+Usage (from backend/):
+    python -m benchmarks.appearance_modes [--runs 5] [--forms i693] [--save-profile fast]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+import fitz
+
+from app.services.pdf_filler import (
+    APPEARANCE_MODES,
+    BUTTON_TYPES,
+    CHECKED_VALUES,
+    FORM_CONFIGS,
+    PDFFillerService,
+)
+from app.services.template_cache import template_cache
+from benchmarks.payloads import full_payload
+
+
+def expected_values(service: PDFFillerService, payload: dict) -> dict:
+    index = service.widget_index(template_cache.get(service.pdf_path))
+    resolved, _ = index.bind(service.form_id, service.field_mapping)
+    expected = {}
+    for key, value in payload.items():
+        for ref in resolved.get(key, ()):
+            if ref.field_type in BUTTON_TYPES:
+                checked = str(value).lower() in CHECKED_VALUES
+                expected[ref.xref] = (ref.field_name, ref.on_state if checked else "Off")
+            else:
+                expected[ref.xref] = (ref.field_name, str(value).strip())
+    return expected
+
+
+def value_mismatches(pdf_bytes: bytes, expected: dict) -> int:
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    seen = {}
+    for page in doc:
+        for widget in page.widgets():
+            if widget.xref in expected:
+                seen[widget.xref] = str(widget.field_value)
+    doc.close()
+    mismatches = 0
+    for xref, (_, value) in expected.items():
+        # PyMuPDF may report button states decoded (' APT ' for '#20APT#20')
+        if seen.get(xref) not in (value, value.replace("#20", " ")):
+            mismatches += 1
+    return mismatches
+
+
+def render(pdf_bytes: bytes, dpi: int = 50) -> list:
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    pixmaps = [page.get_pixmap(dpi=dpi).samples for page in doc]
+    doc.close()
+    return pixmaps
+
+
+def pixel_diff(a: list, b: list) -> float:
+    """Fraction of differing bytes across all pages."""
+    total = diff = 0
+    for pa, pb in zip(a, b):
+        total += len(pa)
+        diff += sum(1 for x, y in zip(pa, pb) if x != y) if pa != pb else 0
+    return diff / total if total else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--forms", nargs="*", default=list(FORM_CONFIGS.keys()))
+    parser.add_argument(
+        "--save-profile", default="fast", help="isolate fill cost from save cost (default: fast)"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+
+    print(
+        f"{'form':<8} {'mode':<9} {'median ms':>10} {'min ms':>8} "
+        f"{'bad values':>11} {'render diff':>12}"
+    )
+    for form_id in args.forms:
+        service = PDFFillerService(form_id)
+        payload = full_payload(service)
+        expected = expected_values(service, payload)
+        service.fill_pdf(payload)  # warm template cache and widget index
+
+        reference = None
+        for mode in APPEARANCE_MODES:
+            timings = []
+            output = b""
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                output = service.fill_pdf(
+                    payload, save_profile=args.save_profile, appearance_mode=mode
+                ).getvalue()
+                timings.append((time.perf_counter() - start) * 1000)
+
+            pixels = render(output)
+            if reference is None:
+                reference = pixels
+            print(
+                f"{form_id:<8} {mode:<9} {statistics.median(timings):>10.0f} {min(timings):>8.0f} "
+                f"{value_mismatches(output, expected):>11} {pixel_diff(reference, pixels):>11.2%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# backend/benchmarks/flatten.py
+"""Output size and render time of editable vs flattened fills for every form in FORM_CONFIGS.
+
+"render ms" is MuPDF rasterizing every page at 72 dpi, a stand-in for the cost
+a viewer or thumbnailer pays on each open.
+
+Usage (from backend/):
+    python -m benchmarks.flatten [--runs 3] [--forms i130] [--save-profile full]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+import fitz
+
+from app.services.pdf_filler import FORM_CONFIGS, PDFFillerService
+from benchmarks.payloads import full_payload
+
+
+def render_ms(pdf_bytes: bytes, dpi: int = 72) -> float:
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    start = time.perf_counter()
+    for page in doc:
+        page.get_pixmap(dpi=dpi)
+    elapsed = (time.perf_counter() - start) * 1000
+    doc.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--forms", nargs="*", default=list(FORM_CONFIGS.keys()))
+    parser.add_argument("--save-profile", default="full")
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+
+    print(
+        f"{'form':<8} {'output':<10} {'fill ms':>8} {'size KB':>8} "
+        f"{'render ms':>10} {'size':>7} {'render':>7}"
+    )
+    for form_id in args.forms:
+        service = PDFFillerService(form_id)
+        payload = full_payload(service)
+        service.fill_pdf(payload)  # warm template cache and widget index
+
+        baseline = None
+        for flatten in (False, True):
+            fill_times, render_times = [], []
+            output = b""
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                output = service.fill_pdf(
+                    payload, save_profile=args.save_profile, flatten=flatten
+                ).getvalue()
+                fill_times.append((time.perf_counter() - start) * 1000)
+                render_times.append(render_ms(output))
+
+            size, render = len(output), statistics.median(render_times)
+            if baseline is None:
+                baseline = (size, render)
+            print(
+                f"{form_id:<8} {'flattened' if flatten else 'editable':<10} "
+                f"{statistics.median(fill_times):>8.0f} {size / 1024:>8.0f} {render:>10.0f} "
+                f"{size / baseline[0] - 1:>+7.0%} {render / baseline[1] - 1:>+7.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# backend/benchmarks/packet.py
+"""/fill-packet merge strategies: filled documents inserted straight from memory
+vs a save/reparse round trip.
+
+"in-memory" is what render_packet does: each form's open document goes into
+insert_pdf. "round trip" saves each form with the fast profile and reopens the
+bytes before inserting them, which is what a form filled in another worker
+would cost even before pickling. Both save the packet once with --save-profile.
+
+Usage (from backend/):
+    python -m benchmarks.packet [--runs 3] [--forms i130 i130a i864 i864a] [--save-profile full]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+import fitz
+
+from app.core.form_configs.packet_config import DEFAULT_PACKET
+from app.services.packet_service import render_packet
+from app.services.pdf_filler import PDFFillerService, save_document
+from benchmarks.payloads import full_payload
+
+
+def round_trip(jobs, save_profile: str) -> bytes:
+    packet = fitz.open()
+    for form_id, payload in jobs:
+        pdf = PDFFillerService(form_id).fill_pdf(payload, save_profile="fast").getvalue()
+        with fitz.open(stream=pdf, filetype="pdf") as src:
+            packet.insert_pdf(src)
+    output = save_document(packet, save_profile).getvalue()
+    packet.close()
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--forms", nargs="*", default=DEFAULT_PACKET)
+    parser.add_argument("--save-profile", default="full")
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+
+    jobs = [(form_id, full_payload(PDFFillerService(form_id))) for form_id in args.forms]
+    strategies = {
+        "in-memory": lambda: render_packet(jobs, {}, args.save_profile).pdf,
+        "round trip": lambda: round_trip(jobs, args.save_profile),
+    }
+    for run in strategies.values():
+        run()  # warm template cache and widget indexes
+
+    print(f"{'strategy':<12} {'median ms':>10} {'min ms':>8} {'size KB':>8}")
+    for name, run in strategies.items():
+        times, output = [], b""
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            output = run()
+            times.append((time.perf_counter() - start) * 1000)
+        print(
+            f"{name:<12} {statistics.median(times):>10.0f} {min(times):>8.0f} "
+            f"{len(output) / 1024:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# backend/benchmarks/payloads.py
+"""Synthetic, deterministic payloads built from each form's FIELD_MAPPING."""
+
+import random
+from typing import Dict
+
+import fitz
+
+from app.core.form_configs import ds260_config
+from app.services.pdf_filler import FORM_CONFIGS, BUTTON_TYPES, PDFFillerService
+from app.services.template_cache import template_cache
+
+# Payload densities: share of mapped keys that carry a value
+DENSITIES = (0.1, 0.5, 1.0)
+
+GENERATOR_FORMS = ("ds260", "police_verification", "authority_letter")
+
+# Fields used by the ReportLab letter generators (they read fixed keys, no mapping)
+LETTER_FIELDS = {
+    "police_verification": [
+        "fullName",
+        "relation",
+        "guardianName",
+        "cnic",
+        "address",
+        "district",
+        "province",
+        "purpose",
+        "email",
+        "phone",
+    ],
+    "authority_letter": [
+        "fullName",
+        "relationType",
+        "relationName",
+        "cnic",
+        "authFullName",
+        "authRelationType",
+        "authRelationName",
+        "authCnic",
+        "authAddress",
+        "authRelationship",
+        "officeLocation",
+        "passportNo",
+        "abroadAddress",
+        "stayFrom",
+        "stayTo",
+    ],
+}
+
+
+def _text_value(key: str, rng: random.Random) -> str:
+    lowered = key.lower()
+    if "date" in lowered or "dob" in lowered:
+        return f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/{rng.randint(1960, 2020)}"
+    if any(part in lowered for part in ("zip", "number", "ssn", "phone", "alien")):
+        return str(rng.randint(10000000, 99999999))
+    return f"{key[:12]} {rng.randint(1, 999)}"
+
+
+def _sample(keys, density: float, rng: random.Random):
+    keys = list(keys)
+    if density >= 1.0:
+        return keys
+    return rng.sample(keys, max(1, int(len(keys) * density)))
+
+
+def build_payload(form_id: str, density: float = 1.0, seed: int = 0) -> Dict[str, str]:
+    """Same form, density and seed always give the same payload."""
+    rng = random.Random(f"{form_id}:{density}:{seed}")
+
+    if form_id == "ds260":
+        keys = _sample(ds260_config.FIELD_MAPPING.keys(), density, rng)
+        return {key: _text_value(key, rng) for key in keys}
+    if form_id in LETTER_FIELDS:
+        keys = _sample(LETTER_FIELDS[form_id], density, rng)
+        return {key: _text_value(key, rng) for key in keys}
+
+    # AcroForm forms: use the template's widget types so checkboxes get checkbox values
+    service = PDFFillerService(form_id)
+    index = service.widget_index(template_cache.get(service.pdf_path))
+    resolved, _ = index.bind(service.form_id, service.field_mapping)
+
+    payload = {}
+    for key in _sample(FORM_CONFIGS[service.form_id].keys(), density, rng):
+        refs = resolved.get(key)
+        if not refs:
+            continue
+        if refs[0].field_type in (fitz.PDF_WIDGET_TYPE_COMBOBOX, fitz.PDF_WIDGET_TYPE_LISTBOX):
+            continue  # only the template's own choices are valid
+        if refs[0].field_type in BUTTON_TYPES:
+            payload[key] = "Yes"
+        else:
+            limit = min([24] + [r.max_len for r in refs if r.max_len])
+            payload[key] = _text_value(key, rng)[:limit]
+    return payload
+
+
+def full_payload(service: PDFFillerService) -> Dict[str, str]:
+    """Every mapped key filled (used by the save-profile and appearance-mode benchmarks)."""
+    return build_payload(service.form_id, density=1.0)
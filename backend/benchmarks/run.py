@@ -0,0 +1,204 @@
+# backend/benchmarks/run.py
+"""Benchmark suite: every AcroForm form in FORM_CONFIGS plus the ReportLab generators.
+
+For each form and payload density, runs the fill in-process (no HTTP, no worker
+pool) and reports p50/p95 latency and peak memory. Results can be saved as a
+baseline and later runs compared against it; a p50 regression beyond the
+threshold makes the command exit non-zero so it can gate CI.
+
+Usage (from backend/):
+    python -m benchmarks.run                              # all forms, all densities
+    python -m benchmarks.run --forms i130 ds260 --runs 10
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.2
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from app.services.pdf_filler import FORM_CONFIGS
+from app.services.pdf_workers import render_form
+from benchmarks.payloads import DENSITIES, GENERATOR_FORMS, build_payload
+
+
+def _rss_bytes() -> Optional[int]:
+    # Linux only; MuPDF allocates outside the Python heap so tracemalloc alone undercounts
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+class _RssSampler:
+    """Samples RSS in a background thread to approximate the peak during a run."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _rss_bytes() or 0)
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.peak = _rss_bytes() or 0
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def bench_case(fn: Callable[[], object], runs: int, warmup: int) -> Dict:
+    for _ in range(warmup):
+        fn()
+
+    gc.collect()
+    timings = []
+    rss_before = _rss_bytes() or 0
+    with _RssSampler() as sampler:
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+
+    # Separate traced run: tracemalloc slows Python code too much to time with it on
+    tracemalloc.start()
+    fn()
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "runs": runs,
+        "p50_ms": round(percentile(timings, 0.5), 1),
+        "p95_ms": round(percentile(timings, 0.95), 1),
+        "min_ms": round(min(timings), 1),
+        "py_peak_kb": round(py_peak / 1024),
+        "rss_peak_delta_kb": round(max(0, sampler.peak - rss_before) / 1024),
+    }
+
+
+def run_suite(
+    forms: List[str], densities: List[float], runs: int, warmup: int, options: Dict
+) -> Dict:
+    results = {}
+    for form_id in forms:
+        for density in densities:
+            payload = build_payload(form_id, density)
+            case = f"{form_id}@{density:g}"
+
+            def fill():
+                return render_form(form_id, payload, options)
+
+            results[case] = {
+                "form": form_id,
+                "density": density,
+                "keys": len(payload),
+                **bench_case(fill, runs, warmup),
+            }
+            r = results[case]
+            print(
+                f"{case:<24} keys={r['keys']:<4} "
+                f"p50={r['p50_ms']:>8.1f}ms p95={r['p95_ms']:>8.1f}ms "
+                f"py_peak={r['py_peak_kb']:>7}KB rss_peak+={r['rss_peak_delta_kb']:>7}KB",
+                flush=True,
+            )
+    return results
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    regressions = []
+    print(f"\n{'case':<24} {'base p50':>10} {'now p50':>10} {'change':>8}")
+    for case, now in results.items():
+        base = baseline.get("results", {}).get(case)
+        if not base:
+            print(f"{case:<24} {'-':>10} {now['p50_ms']:>10.1f} {'new':>8}")
+            continue
+        change = (now["p50_ms"] - base["p50_ms"]) / base["p50_ms"] if base["p50_ms"] else 0.0
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{case:<24} {base['p50_ms']:>10.1f} {now['p50_ms']:>10.1f} {change:>+7.0%}{flag}")
+        if flag:
+            regressions.append(case)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--forms", nargs="*", default=list(FORM_CONFIGS.keys()) + list(GENERATOR_FORMS)
+    )
+    parser.add_argument("--densities", nargs="*", type=float, default=list(DENSITIES))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument(
+        "--save-profile", default=None, help="fill_pdf save_profile (default: server default)"
+    )
+    parser.add_argument(
+        "--appearance-mode", default=None, help="fill_pdf appearance_mode (default: server default)"
+    )
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--save-baseline", help="write results to this file")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed p50 slowdown (default 0.2 = 20%%)"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+
+    options = {}
+    if args.save_profile:
+        options["save_profile"] = args.save_profile
+    if args.appearance_mode:
+        options["appearance_mode"] = args.appearance_mode
+
+    results = run_suite(args.forms, args.densities, args.runs, args.warmup, options)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "options": options,
+        "results": results,
+    }
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(
+                f"\n{len(regressions)} case(s) slower than baseline "
+                f"by more than {args.threshold:.0%}"
+            )
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# backend/benchmarks/save_profiles.py
+"""Latency and output size of each save profile for every form in FORM_CONFIGS.
+
+Usage (from backend/):
+    python -m benchmarks.save_profiles [--runs 5] [--forms i130 i864]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+from app.services.pdf_filler import FORM_CONFIGS, SAVE_PROFILES, PDFFillerService
+from app.services.template_cache import template_cache
+from benchmarks.payloads import full_payload
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--forms", nargs="*", default=list(FORM_CONFIGS.keys()))
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+
+    print(
+        f"{'form':<8} {'profile':<12} {'median ms':>10} {'min ms':>8} "
+        f"{'size KB':>9} {'template KB':>12}"
+    )
+    for form_id in args.forms:
+        service = PDFFillerService(form_id)
+        payload = full_payload(service)
+        template_kb = template_cache.get(service.pdf_path).size / 1024
+        service.fill_pdf(payload)  # warm template cache and widget index
+
+        for profile in SAVE_PROFILES:
+            timings = []
+            size = 0
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                output = service.fill_pdf(payload, save_profile=profile)
+                timings.append((time.perf_counter() - start) * 1000)
+                size = len(output.getvalue())
+            print(
+                f"{form_id:<8} {profile:<12} {statistics.median(timings):>10.0f} "
+                f"{min(timings):>8.0f} {size / 1024:>9.0f} {template_kb:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
 # C:\Users\HP\Desktop\arachnie\Arachnie\backend\main.py
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.services.pdf_workers import pdf_pool
+from app.services.image_workers import image_pool
+from app.services.form_registry import FORM_CONFIGS, parse_form_list
+from app.services.fill_jobs import fill_jobs
+from app.services.output_cache import expire_periodically, output_cache, preview_cache
 import uvicorn
 
 # Routers
@@ -11,12 +18,38 @@ from app.api.v1.visa_checker import router as visa_checker_router
 from app.api.v1.pdf_routes import router as pdf_router
 # from app.api.v1.whatsapp import router as whatsapp_router
 from app.api.v1.compress import router as compress_router  # NEW IMPORT
+from app.api.v1.metrics import router as metrics_router
+from app.api.v1.fill_jobs import router as fill_jobs_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared process pool for PDF generation, created once per worker
+    pdf_pool.start()
+    warmup_forms = parse_form_list(settings.WARMUP_FORMS)
+    if warmup_forms:
+        # Parent only needs the mappings (output-cache keys); templates load in the workers
+        FORM_CONFIGS.load(warmup_forms)
+        pdf_pool.prestart()
+    # Image recompression for /compress; workers spawn on first use
+    image_pool.start()
+    # Background fill jobs; resumes anything left queued by the previous process
+    await fill_jobs.start()
+    # Filled PDFs and previews hold PII: delete them on their TTL even when idle
+    cache_expiry = asyncio.create_task(expire_periodically([output_cache, preview_cache]))
+    yield
+    cache_expiry.cancel()
+    await fill_jobs.stop()
+    image_pool.shutdown()
+    pdf_pool.shutdown()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="Immigration Assistant with Visa Bulletin Checker",
     version=settings.VERSION,
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -46,9 +79,11 @@ def health():
 app.include_router(remove_bg_router, prefix="/api/v1", tags=["remove-bg"])
 app.include_router(iv_schedule_router, prefix="/api/v1", tags=["iv-schedule"])
 app.include_router(pdf_router, prefix="/api/v1", tags=["pdf-forms"])
+app.include_router(fill_jobs_router, prefix="/api/v1", tags=["pdf-jobs"])
 app.include_router(visa_checker_router, prefix="/api/v1/visa-checker", tags=["visa-checker"])
 # app.include_router(whatsapp_router, prefix="/api/v1", tags=["whatsapp-ai"])
 app.include_router(compress_router, prefix="/api/v1", tags=["pdf-compress"]) 
+app.include_router(metrics_router, prefix="/api/v1", tags=["metrics"])
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
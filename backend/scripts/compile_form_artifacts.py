@@ -0,0 +1,47 @@
+# backend/scripts/compile_form_artifacts.py
+"""Compile each form's FIELD_MAPPING + PDF template into a binary artifact.
+
+Run after changing a template in pdfs/ or a config in app/core/form_configs/
+(stale artifacts are detected and ignored, so the service falls back to
+scanning the template until they are rebuilt):
+
+    cd backend
+    python scripts/compile_form_artifacts.py            # every form
+    python scripts/compile_form_artifacts.py i130 i864
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.form_artifacts import compile_form  # noqa: E402
+from app.services.form_registry import FORM_CONFIG_MODULES  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("forms", nargs="*", default=list(FORM_CONFIG_MODULES))
+    args = parser.parse_args()
+
+    failed = 0
+    for form_id in args.forms:
+        start = time.perf_counter()
+        try:
+            path, size = compile_form(form_id)
+        except Exception as e:
+            failed += 1
+            print(f"{form_id:<8} FAILED: {e}")
+            continue
+        print(
+            f"{form_id:<8} {size:>8} bytes  {(time.perf_counter() - start) * 1000:>7.0f} ms  {path}"
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
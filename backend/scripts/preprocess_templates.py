@@ -0,0 +1,49 @@
+# backend/scripts/preprocess_templates.py
+"""Build the preprocessed copy of each form's PDF template (XFA removed, objects deduplicated).
+
+The service builds missing copies on first use; run this after changing a
+template in pdfs/ so the copies (and the compiled form artifacts, which are
+keyed to the preprocessed bytes) can be committed together:
+
+    cd backend
+    python scripts/preprocess_templates.py && python scripts/compile_form_artifacts.py
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.form_registry import FORM_CONFIG_MODULES  # noqa: E402
+from app.services.pdf_filler import _probe_pdf_template  # noqa: E402
+from app.services.template_preprocess import build_preprocessed  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("forms", nargs="*", default=list(FORM_CONFIG_MODULES))
+    args = parser.parse_args()
+
+    failed = 0
+    for form_id in args.forms:
+        start = time.perf_counter()
+        try:
+            source = _probe_pdf_template(form_id)
+            path = build_preprocessed(source)
+        except Exception as e:
+            failed += 1
+            print(f"{form_id:<8} FAILED: {e}")
+            continue
+        print(
+            f"{form_id:<8} {os.path.getsize(source):>8} → {os.path.getsize(path):>8} bytes  "
+            f"{(time.perf_counter() - start) * 1000:>7.0f} ms  {path}"
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
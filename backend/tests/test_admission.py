@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import DEFAULT_LIMITS, Limiter, Overloaded, _parse_limits
+
+
+async def _hold(limiter: Limiter, entered: asyncio.Event, release: asyncio.Event):
+    async with limiter.slot():
+        entered.set()
+        await release.wait()
+
+
+def test_waiters_are_admitted_in_order():
+    async def scenario():
+        limiter = Limiter("test", limit=1, max_waiting=2, max_wait_seconds=5)
+        order = []
+
+        async def job(name):
+            async with limiter.slot():
+                order.append(name)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(job(name) for name in "abc"))
+        return order, limiter
+
+    order, limiter = asyncio.run(scenario())
+    assert order == ["a", "b", "c"]
+    assert (limiter.active, limiter.waiting) == (0, 0)
+
+
+def test_full_wait_queue_is_rejected_with_retry_after():
+    async def scenario():
+        limiter = Limiter("test", limit=1, max_waiting=1, max_wait_seconds=5)
+        entered, release = asyncio.Event(), asyncio.Event()
+        holder = asyncio.create_task(_hold(limiter, entered, release))
+        await entered.wait()
+        waiter = asyncio.create_task(_hold(limiter, asyncio.Event(), release))
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+        try:
+            async with limiter.slot():
+                pytest.fail("admitted past a full wait queue")
+        finally:
+            release.set()
+            await asyncio.gather(holder, waiter)
+            assert (limiter.active, limiter.waiting) == (0, 0)
+
+    with pytest.raises(Overloaded) as exc_info:
+        asyncio.run(scenario())
+    assert exc_info.value.status_code == 503
+    assert 1 <= int(exc_info.value.headers["Retry-After"]) <= 60
+
+
+def test_wait_times_out():
+    async def scenario():
+        limiter = Limiter("test", limit=1, max_waiting=4, max_wait_seconds=0.05)
+        entered, release = asyncio.Event(), asyncio.Event()
+        holder = asyncio.create_task(_hold(limiter, entered, release))
+        await entered.wait()
+        try:
+            with pytest.raises(Overloaded):
+                async with limiter.slot():
+                    pass
+            assert limiter.waiting == 0
+        finally:
+            release.set()
+            await holder
+        # The slot is free again once the holder leaves
+        async with limiter.slot():
+            assert limiter.active == 1
+
+    asyncio.run(scenario())
+
+
+def test_parse_limits():
+    limits = _parse_limits("compress=3:5, remove-bg=2, new=4, broken, bad=x:1")
+    assert limits["compress"] == (3, 5)
+    assert limits["remove-bg"] == (2, DEFAULT_LIMITS["remove-bg"][1])
+    assert limits["new"] == (4, 0)
+    assert "broken" not in limits and "bad" not in limits
+    assert limits["passport-photo"] == DEFAULT_LIMITS["passport-photo"]
@@ -0,0 +1,174 @@
+import fitz
+import pytest
+
+from app.services.field_converters import (
+    FORMAT_A_NUMBER,
+    FORMAT_DATE,
+    FORMAT_ZIP,
+    KIND_BUTTON,
+    KIND_CHOICE,
+    KIND_TEXT,
+    FieldConverter,
+    build_converters,
+    convert,
+    converter_for,
+    validate_form_data,
+)
+from app.services.pdf_filler import WidgetRef
+
+
+def text_ref(name: str, max_len: int = 0, comb: bool = False) -> WidgetRef:
+    return WidgetRef(0, 10, fitz.PDF_WIDGET_TYPE_TEXT, name, 10, "", max_len, comb)
+
+
+def checkbox_ref(name: str, on_state: str = "Y") -> WidgetRef:
+    return WidgetRef(0, 11, fitz.PDF_WIDGET_TYPE_CHECKBOX, name, 11, on_state)
+
+
+def combo_ref(name: str, choices) -> WidgetRef:
+    return WidgetRef(0, 12, fitz.PDF_WIDGET_TYPE_COMBOBOX, name, 12, "", choices=tuple(choices))
+
+
+@pytest.mark.parametrize(
+    "name, fmt",
+    [
+        ("form1[0].Pt1Line1_AlienNumber[0]", FORMAT_A_NUMBER),
+        ("form1[0].Pt2Line4_ZipCode[0]", FORMAT_ZIP),
+        ("form1[0].Pt2Line8_DateofBirth[0]", FORMAT_DATE),
+        ("form1[0].Pt2Line4_CityOrTown[0]", ""),
+    ],
+)
+def test_format_comes_from_widget_leaf_name(name, fmt):
+    assert converter_for((text_ref(name),)).format == fmt
+
+
+def test_converter_kinds():
+    assert converter_for((checkbox_ref("Yes[0]"),)) == FieldConverter(KIND_BUTTON, on_state="Y")
+    conv = converter_for((combo_ref("State[0]", [" ", "CA", "NY"]),))
+    assert conv.kind == KIND_CHOICE
+    assert conv.choices["ca"] == "CA"
+    conv = converter_for((text_ref("Name[0]", max_len=10), text_ref("Name[1]", max_len=5)))
+    assert (conv.kind, conv.max_len) == (KIND_TEXT, 5)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("A123456789", "123456789"),
+        ("a-012-345-678", "012345678"),
+        ("A1234567", "001234567"),
+        ("12345678", "012345678"),
+    ],
+)
+def test_a_number_is_nine_digits(value, expected):
+    conv = FieldConverter(KIND_TEXT, max_len=9, comb=True, format=FORMAT_A_NUMBER)
+    assert convert(conv, value) == (expected, None)
+
+
+def test_unrecognized_a_number_is_written_with_a_warning():
+    conv = FieldConverter(KIND_TEXT, max_len=9, format=FORMAT_A_NUMBER)
+    value, warning = convert(conv, "A12-34-567-8901")
+    assert value == "A12-34-567-8901"
+    assert "longer than 9" in warning
+
+
+def test_zip_plus_4_keeps_five_digits_only_when_it_does_not_fit():
+    assert convert(FieldConverter(KIND_TEXT, max_len=5, format=FORMAT_ZIP), "94105-1234") == (
+        "94105",
+        None,
+    )
+    assert convert(FieldConverter(KIND_TEXT, max_len=10, format=FORMAT_ZIP), "94105-1234") == (
+        "94105-1234",
+        None,
+    )
+
+
+def test_iso_dates_are_rewritten_for_the_form():
+    conv = FieldConverter(KIND_TEXT, format=FORMAT_DATE)
+    assert convert(conv, "1990-07-04") == ("07/04/1990", None)
+    assert convert(conv, "07/04/1990") == ("07/04/1990", None)
+    assert convert(conv, "1990-13-45") == ("1990-13-45", None)
+
+
+def test_comb_fields_drop_separators_to_fit():
+    conv = FieldConverter(KIND_TEXT, max_len=9, comb=True)
+    assert convert(conv, "123-45-6789") == ("123456789", None)
+
+
+@pytest.mark.parametrize("value", ["California", "california", "CA", " ca "])
+def test_state_names_map_to_combo_codes(value):
+    conv = converter_for((combo_ref("State[0]", [" ", "CA", "NY"]),))
+    assert convert(conv, value) == ("CA", None)
+
+
+def test_unknown_choice_is_a_warning():
+    conv = converter_for((combo_ref("State[0]", [" ", "CA", "NY"]),))
+    value, warning = convert(conv, "Atlantis")
+    assert value == "Atlantis"
+    assert "'Atlantis' is not one of ['CA', 'NY']" == warning
+
+
+@pytest.mark.parametrize(
+    "value, checked",
+    [(True, True), (False, False), ("y", True), ("Yes", True), ("n", False), ("", False)],
+)
+def test_checkbox_values(value, checked):
+    assert convert(FieldConverter(KIND_BUTTON, on_state="Y"), value) == (checked, None)
+
+
+def test_checkbox_on_state_and_unknown_values():
+    conv = FieldConverter(KIND_BUTTON, on_state="APT")
+    assert convert(conv, "apt") == (True, None)
+    value, warning = convert(conv, "maybe")
+    assert value is False
+    assert "left unchecked" in warning
+
+
+def test_structured_values_cannot_be_written():
+    with pytest.raises(ValueError, match="single value"):
+        convert(FieldConverter(KIND_TEXT), {"city": "Austin"})
+
+
+def test_validate_form_data_sorts_every_key():
+    field_mapping = {
+        "aNumber": "form1[0].AlienNumber[0]",
+        "state": "form1[0].State[0]",
+        "married": "form1[0].Married[0]",
+        "address": "form1[0].Street[0]",
+        "blank": "form1[0].Middle[0]",
+        "nowhere": "form1[0].Missing[0]",
+        "twice": "form1[0].Twice[0]",
+    }
+    resolved = {
+        "aNumber": (text_ref("form1[0].AlienNumber[0]", max_len=9),),
+        "state": (combo_ref("form1[0].State[0]", ["CA", "NY"]),),
+        "married": (checkbox_ref("form1[0].Married[0]"),),
+        "address": (text_ref("form1[0].Street[0]"),),
+        "blank": (text_ref("form1[0].Middle[0]"),),
+    }
+    ambiguous = {"twice": ["form1[0].A.Twice[0]", "form1[0].B.Twice[0]"]}
+    form_data = {
+        "aNumber": "A-12345678",
+        "state": "Oregon",
+        "married": "y",
+        "address": ["1 Main St"],
+        "blank": "  ",
+        "nowhere": "x",
+        "twice": "x",
+        "extra": "x",
+    }
+
+    values, report = validate_form_data(
+        form_data, field_mapping, build_converters(resolved), ambiguous
+    )
+
+    assert values == {"aNumber": "012345678", "state": "Oregon", "married": True}
+    assert report.filled == ["aNumber", "married", "state"]
+    assert report.unmapped == ["extra"]
+    assert report.unresolved == ["nowhere"]
+    assert report.ambiguous == ["twice"]
+    assert report.empty == ["blank"]
+    assert report.invalid == {"address": "expected a single value"}
+    assert list(report.warnings) == ["state"]
+    assert not report.ok
+    assert report.header().startswith("filled=3; unmapped=1; unresolved=1; ambiguous=1; empty=1")
@@ -0,0 +1,22 @@
+from app.services.fill_jobs import DONE, FAILED, MAX_ATTEMPTS, QUEUED, JobStore
+
+
+def test_interrupted_jobs_are_requeued_until_max_attempts(tmp_path):
+    store = JobStore(str(tmp_path))
+    store.insert("a", "i130", {}, {})
+    store.insert("b", "i130", {}, {})
+    store.mark_done("b", b"%PDF", {})
+
+    for attempt in range(1, MAX_ATTEMPTS):
+        assert store.mark_running("a") == attempt
+        assert store.requeue_interrupted() == ["a"]
+        assert store.get("a")["status"] == QUEUED
+
+    assert store.mark_running("a") == MAX_ATTEMPTS
+    assert store.requeue_interrupted() == []
+    row = store.get("a")
+    assert row["status"] == FAILED
+    assert row["error"]
+    assert store.get("b")["status"] == DONE
+    store.close()
+
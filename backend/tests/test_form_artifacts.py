@@ -0,0 +1,104 @@
+import hashlib
+import struct
+from types import SimpleNamespace
+
+import fitz
+import pytest
+
+from app.core.config import settings
+from app.services.form_artifacts import (
+    HEADER,
+    ArtifactError,
+    build_artifact,
+    load_widget_index,
+    parse_artifact,
+)
+from app.services.pdf_filler import WidgetIndex, WidgetRef
+
+TEMPLATE_SHA = hashlib.sha256(b"template").digest()
+
+FIELD_MAPPING = {
+    "lastName": "form1[0].Pt1[0].FamilyName[0]",
+    "married": "form1[0].Pt1[0].Married[0]",
+    "state": "State[0]",
+    "city": "City[0]",  # suffix shared by two widgets
+    "missing": "form1[0].Nowhere[0]",
+}
+
+
+@pytest.fixture
+def index():
+    return WidgetIndex.from_refs(
+        [
+            WidgetRef(
+                0, 10, fitz.PDF_WIDGET_TYPE_TEXT, "form1[0].Pt1[0].FamilyName[0]", 10, "", 33
+            ),
+            WidgetRef(0, 11, fitz.PDF_WIDGET_TYPE_CHECKBOX, "form1[0].Pt1[0].Married[0]", 9, "Y"),
+            WidgetRef(0, 12, fitz.PDF_WIDGET_TYPE_CHECKBOX, "form1[0].Pt1[0].Married[0]", 9, "N"),
+            WidgetRef(
+                1,
+                13,
+                fitz.PDF_WIDGET_TYPE_COMBOBOX,
+                "form1[0].Pt2[0].State[0]",
+                13,
+                "",
+                choices=(" ", "CA", "NY"),
+            ),
+            WidgetRef(1, 14, fitz.PDF_WIDGET_TYPE_TEXT, "form1[0].Pt2[0].Zip[0]", 14, "", 5, True),
+            WidgetRef(1, 15, fitz.PDF_WIDGET_TYPE_TEXT, "form1[0].Home[0].City[0]", 15, ""),
+            WidgetRef(1, 16, fitz.PDF_WIDGET_TYPE_TEXT, "form1[0].Work[0].City[0]", 16, ""),
+        ]
+    )
+
+
+def test_round_trip_matches_the_runtime_scan(index):
+    data = build_artifact(TEMPLATE_SHA, FIELD_MAPPING, index)
+    widgets, resolved, ambiguous = parse_artifact(data, TEMPLATE_SHA, FIELD_MAPPING)
+
+    assert widgets == index.refs
+    assert (resolved, ambiguous) == index.bind("scan", FIELD_MAPPING)
+    assert [ref.on_state for ref in resolved["married"]] == ["Y", "N"]
+    assert resolved["state"][0].choices == (" ", "CA", "NY")
+    assert sorted(ambiguous["city"]) == ["form1[0].Home[0].City[0]", "form1[0].Work[0].City[0]"]
+    assert "missing" not in resolved and "missing" not in ambiguous
+
+
+def test_template_change_is_rejected(index):
+    data = build_artifact(TEMPLATE_SHA, FIELD_MAPPING, index)
+    with pytest.raises(ArtifactError, match="template changed"):
+        parse_artifact(data, hashlib.sha256(b"other").digest(), FIELD_MAPPING)
+
+
+def test_mapping_change_is_rejected(index):
+    data = build_artifact(TEMPLATE_SHA, FIELD_MAPPING, index)
+    changed = {**FIELD_MAPPING, "firstName": "form1[0].Pt1[0].GivenName[0]"}
+    with pytest.raises(ArtifactError, match="field mapping changed"):
+        parse_artifact(data, TEMPLATE_SHA, changed)
+
+
+def test_other_format_version_is_rejected(index):
+    data = bytearray(build_artifact(TEMPLATE_SHA, FIELD_MAPPING, index))
+    struct.pack_into("<H", data, 4, 1)
+    with pytest.raises(ArtifactError, match="unsupported artifact"):
+        parse_artifact(bytes(data), TEMPLATE_SHA, FIELD_MAPPING)
+
+
+def test_load_widget_index_preloads_the_binding(index, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FORM_ARTIFACTS_DIR", str(tmp_path))
+    (tmp_path / "i130.fma").write_bytes(build_artifact(TEMPLATE_SHA, FIELD_MAPPING, index))
+
+    loaded = load_widget_index("i130", FIELD_MAPPING, SimpleNamespace(sha256=TEMPLATE_SHA))
+
+    assert loaded.refs == index.refs
+    assert loaded.bind("i130", FIELD_MAPPING) == index.bind("scan", FIELD_MAPPING)
+
+
+@pytest.mark.parametrize("cut", [0, HEADER.size - 1, HEADER.size + 8, -1])
+def test_unusable_artifact_falls_back_to_the_scan(index, tmp_path, monkeypatch, cut):
+    monkeypatch.setattr(settings, "FORM_ARTIFACTS_DIR", str(tmp_path))
+    template = SimpleNamespace(sha256=TEMPLATE_SHA)
+    assert load_widget_index("i130", FIELD_MAPPING, template) is None
+
+    data = build_artifact(TEMPLATE_SHA, FIELD_MAPPING, index)
+    (tmp_path / "i130.fma").write_bytes(data[:cut])
+    assert load_widget_index("i130", FIELD_MAPPING, template) is None
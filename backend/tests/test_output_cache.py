@@ -0,0 +1,106 @@
+import os
+import time
+from types import SimpleNamespace
+
+from app.services import output_cache
+from app.services.output_cache import OutputCache, canonical_form_data
+
+
+def test_least_recently_used_is_evicted_first(tmp_path):
+    cache = OutputCache(str(tmp_path), max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a")  # a is now the most recent
+    cache.put("c", b"cccc")
+
+    assert cache.get("b") is None
+    assert not (tmp_path / "b.pdf").exists()
+    assert open(cache.get("a"), "rb").read() == b"aaaa"
+    assert open(cache.get("c"), "rb").read() == b"cccc"
+    assert cache.stats()["bytes"] == 8
+
+
+def test_overwrite_replaces_the_size(tmp_path):
+    cache = OutputCache(str(tmp_path), max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("a", b"aaaaaaaa")
+    cache.put("b", b"bb")
+    assert cache.stats()["bytes"] == 10
+    assert cache.get("a") and cache.get("b")
+
+
+def test_oversized_or_disabled_is_not_stored(tmp_path):
+    cache = OutputCache(str(tmp_path), max_bytes=4)
+    cache.put("big", b"12345")
+    assert cache.get("big") is None
+
+    disabled = OutputCache(str(tmp_path / "off"), max_bytes=0)
+    disabled.put("a", b"a")
+    assert disabled.get("a") is None
+    assert not (tmp_path / "off").exists()
+
+
+def test_recency_survives_a_restart(tmp_path):
+    for key, mtime in (("old", 1_000), ("new", 2_000)):
+        path = tmp_path / f"{key}.pdf"
+        path.write_bytes(b"xxxx")
+        os.utime(path, (mtime, mtime))
+
+    cache = OutputCache(str(tmp_path), max_bytes=10)
+    cache.put("c", b"cccc")
+
+    assert cache.get("old") is None
+    assert cache.get("new") and cache.get("c")
+
+
+def test_entries_expire_after_the_ttl_even_when_hit(tmp_path, monkeypatch):
+    clock = [1_000.0]
+    monkeypatch.setattr(output_cache, "time", SimpleNamespace(time=lambda: clock[0]))
+    cache = OutputCache(str(tmp_path), max_bytes=10, ttl_seconds=60)
+    cache.put("a", b"aaaa")
+    clock[0] += 30
+    cache.put("b", b"bbbb")
+    assert cache.get("a")
+
+    clock[0] += 31
+    assert cache.get("a") is None
+    assert not (tmp_path / "a.pdf").exists()
+    assert cache.get("b")
+    assert cache.stats()["bytes"] == 4
+
+    clock[0] += 30
+    assert cache.expire() == 1
+    assert not (tmp_path / "b.pdf").exists()
+
+
+def test_expired_files_are_deleted_on_load(tmp_path):
+    for key, written in (("old", time.time() - 120), ("new", time.time())):
+        path = tmp_path / f"{key}.pdf"
+        path.write_bytes(b"xxxx")
+        os.utime(path, (written, written))
+
+    cache = OutputCache(str(tmp_path), max_bytes=10, ttl_seconds=60)
+
+    assert cache.get("old") is None
+    assert not (tmp_path / "old.pdf").exists()
+    assert cache.get("new")
+
+
+def test_file_removed_behind_the_cache_is_a_miss(tmp_path):
+    cache = OutputCache(str(tmp_path), max_bytes=10)
+    cache.put("a", b"aaaa")
+    os.unlink(tmp_path / "a.pdf")
+
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_equivalent_payloads_share_a_key():
+    mapping = {"name": "Name[0]", "city": "City[0]"}
+    first = canonical_form_data({"name": "Ann", "city": " ", "unmapped": "x"}, mapping)
+    second = canonical_form_data({"name": "Ann"}, mapping)
+    key = OutputCache.make_key("i130", "v1", first, {"flatten": False})
+
+    assert key == OutputCache.make_key("i130", "v1", second, {"flatten": False})
+    assert key != OutputCache.make_key("i130", "v2", second, {"flatten": False})
+    assert key != OutputCache.make_key("i130", "v1", second, {"flatten": True})
@@ -0,0 +1,65 @@
+import os
+
+import fitz
+import pytest
+
+from app.core.form_configs.i693_config import FIELD_MAPPING as I693_MAPPING
+from app.services.pdf_filler import WidgetIndex
+
+I693_PDF = os.path.join(os.path.dirname(__file__), "..", "pdfs", "i-693.pdf")
+
+
+def index_for(*names: str) -> WidgetIndex:
+    doc = fitz.open()
+    page = doc.new_page()
+    for i, name in enumerate(names):
+        widget = fitz.Widget()
+        widget.field_type = fitz.PDF_WIDGET_TYPE_TEXT
+        widget.field_name = name
+        widget.rect = fitz.Rect(10, 10 + 30 * i, 200, 30 + 30 * i)
+        page.add_widget(widget)
+    return WidgetIndex(doc)
+
+
+def test_exact_match_also_fills_unclaimed_suffix_twins():
+    index = index_for(
+        "form1[0].Pt1[0].Name[0]",
+        "form1[0].Pt9[0].Name[0]",  # unmapped repeat
+        "form1[0].Pt5[0].Name[0]",  # has its own key
+    )
+    mapping = {"name": "form1[0].Pt1[0].Name[0]", "otherName": "form1[0].Pt5[0].Name[0]"}
+
+    resolved, ambiguous = index.bind("test", mapping)
+
+    assert [ref.field_name for ref in resolved["name"]] == [
+        "form1[0].Pt1[0].Name[0]",
+        "form1[0].Pt9[0].Name[0]",
+    ]
+    assert [ref.field_name for ref in resolved["otherName"]] == [
+        "form1[0].Pt5[0].Name[0]",
+        "form1[0].Pt9[0].Name[0]",
+    ]
+    assert ambiguous == {}
+
+
+def test_suffix_only_match_with_several_names_is_ambiguous():
+    index = index_for("form1[0].A[0].City[0]", "form1[0].B[0].City[0]")
+    resolved, ambiguous = index.bind("test", {"city": "form1[0].City[0]"})
+    assert resolved == {}
+    assert sorted(ambiguous["city"]) == ["form1[0].A[0].City[0]", "form1[0].B[0].City[0]"]
+
+
+@pytest.mark.skipif(not os.path.exists(I693_PDF), reason="I-693 template missing")
+@pytest.mark.parametrize(
+    "key, name",
+    [
+        ("pt1_l1a_familyname", "form1[0].P13[0].Pt1Line1a_FamilyName[0]"),
+        ("pt1_l1b_givenname", "form1[0].P13[0].Pt1Line1b_GivenName[0]"),
+        ("pt1_l1c_middlename", "form1[0].P13[0].Pt1Line1c_MiddleName[0]"),
+    ],
+)
+def test_i693_p13_name_repeats_are_filled(key, name):
+    with fitz.open(I693_PDF) as doc:
+        index = WidgetIndex(doc)
+    resolved, _ = index.bind("i693", I693_MAPPING)
+    assert name in [ref.field_name for ref in resolved[key]]